@@ -1,44 +1,147 @@
-from abc import ABC, abstractmethod
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_community.chat_message_histories import SQLChatMessageHistory
+from abc import ABC
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder, PromptTemplate
+from langchain_core.messages import AIMessage, HumanMessage
+from chat.history import BoundedChatMessageHistory, open_history_store
 from prompts.prompts import Templates
 from config.config import Config
 from utils.logger import get_logger
+import threading
+import asyncio
+import time
 
 logger = get_logger(__name__)
 
+HISTORY_PROMPTS = {"contextual": Templates.CONTEXTUAL_PROMPT, "general": Templates.GENERAL_PROMPT}
+
 class BaseChat(ABC):
-    """Abstract base class for chat models."""
+    """Abstract base class for chat models.
+
+    Subclasses set model_name, their temperature and max_tokens, and model; the
+    prompt chains are compiled once per instance and cached by prompt type, with
+    context, question and the bounded session history supplied at invocation time.
+    """
 
-    def __init__(self, model_name):
+    def __init__(self, model_name, temperature=None, max_tokens=None):
         self.model_name = model_name
+        self.temperature = temperature
+        self.max_tokens = max_tokens
         self.model = None
+        self._chains = {}
+        self._chains_lock = threading.Lock()
 
     def get_message_history(self, session_id):
-        return SQLChatMessageHistory(
-            session_id=session_id, connection_string=Config.CHAT_HISTORY_DB_URI
+        return BoundedChatMessageHistory(
+            session_id=session_id, summarizer=self.summarize_history, store=open_history_store(Config.CHAT_HISTORY_DB_URI)
         )
-    
+
+    def summarize_history(self, summary, messages):
+        """Fold messages that dropped out of the history window into the session's rolling summary."""
+        formatted_messages = "\n".join([f"{msg.type}: {msg.content}" for msg in messages])
+        formatted_prompt = Templates.SUMMARY_PROMPT.format(summary=summary or "None", messages=formatted_messages)
+        return self.model.invoke(formatted_prompt).content.strip()
+
     def select_prompt(self, context):
         if context:
             logger.info("Using context-based prompt.")
-            return Templates.CONTEXTUAL_PROMPT.format(context=context, question="{question}")
+            return "contextual"
         else:
             logger.info("Using general knowledge prompt.")
-            return Templates.GENERAL_PROMPT.format(question="{question}")
-        
-    @abstractmethod
+            return "general"
+
+    def _build_chain(self, prompt_type):
+        if prompt_type == "qa":
+            return PromptTemplate.from_template(Templates.QA_PROMPT) | self.model
+
+        full_prompt_template = ChatPromptTemplate.from_messages(
+            [
+                ("system", "You are a helpful assistant."),
+                MessagesPlaceholder(variable_name="history"),
+                ("human", HISTORY_PROMPTS[prompt_type])
+            ]
+        )
+        return full_prompt_template | self.model
+
+    def chain(self, prompt_type):
+        """The compiled chain for "qa", "contextual" or "general", built on first use."""
+        chain = self._chains.get(prompt_type)
+        if chain is None:
+            with self._chains_lock:
+                chain = self._chains.get(prompt_type)
+                if chain is None:
+                    chain = self._chains[prompt_type] = self._build_chain(prompt_type)
+                    logger.info(f"Compiled {prompt_type} chain for {self.model_name}.")
+        return chain
+
+    @staticmethod
+    def response_text(raw_response):
+        return (
+            raw_response.content.strip() if hasattr(raw_response, "content") and isinstance(raw_response.content, str)
+            else "I'm sorry, but I couldn't generate a response for this query."
+        )
+
     def generate_response(self, query, context):
-        """
-        Generate a response based on the query and context.
-        This method must be implemented by subclasses.
-        """
-        pass
+        """Generate a structured response"""
+        logger.info(f"Generating response using {self.model_name}")
+        raw_response = self.chain("qa").invoke({"context": context, "question": query})
+        logger.debug(f"Raw response from {self.model_name}: \n{raw_response}")
+        return self.response_text(raw_response)
 
-    @abstractmethod
     def generate_response_with_history(self, query, context, session_id):
-        """
-        Generate a response based on the query and context.
-        This method must be implemented by subclasses.
-        """
-        pass
\ No newline at end of file
+        """Generate a structured response with chat session history"""
+        logger.info(f"Generating response with chat session history for session: {session_id}")
+        chat_history = self.get_message_history(session_id)
+        raw_response = self.chain(self.select_prompt(context)).invoke(
+            {"question": query, "context": context, "history": chat_history.messages}
+        )
+        logger.debug(f"Raw response from {self.model_name}: \n{raw_response}")
+        chat_history.add_messages([HumanMessage(content=query), raw_response])
+        return self.response_text(raw_response)
+
+    async def agenerate_response(self, query, context):
+        """Async generate_response using the chat model's native async invoke."""
+        logger.info(f"Generating response asynchronously using {self.model_name}")
+        raw_response = await self.chain("qa").ainvoke({"context": context, "question": query})
+        return self.response_text(raw_response)
+
+    async def agenerate_response_with_history(self, query, context, session_id):
+        """Async generate_response_with_history; the SQL chat history is synchronous, so this runs in a worker thread."""
+        return await asyncio.to_thread(self.generate_response_with_history, query, context, session_id)
+
+    def stream_text(self, chunks, metrics):
+        """Yield the text of streamed chunks, recording time to first token and total latency in metrics."""
+        start = time.perf_counter()
+        for chunk in chunks:
+            text = chunk.content if hasattr(chunk, "content") else chunk
+            if "first_token_seconds" not in metrics and isinstance(text, str):
+                text = text.lstrip()
+            if not isinstance(text, str) or not text:
+                continue
+            if "first_token_seconds" not in metrics:
+                metrics["first_token_seconds"] = time.perf_counter() - start
+                logger.info(f"Time to first token from {self.model_name}: {metrics['first_token_seconds']:.3f}s")
+            yield text
+        metrics["total_seconds"] = time.perf_counter() - start
+        logger.info(f"Streamed response from {self.model_name} in {metrics['total_seconds']:.3f}s.")
+
+    def stream_response(self, query, context, metrics=None):
+        """Stream a response token by token."""
+        logger.info(f"Streaming response using {self.model_name}")
+        chunks = self.chain("qa").stream({"context": context, "question": query})
+        return self.stream_text(chunks, {} if metrics is None else metrics)
+
+    def stream_response_with_history(self, query, context, session_id, metrics=None):
+        """Stream a response token by token; the exchange is saved to the session history once the stream completes."""
+        logger.info(f"Streaming response with chat session history for session: {session_id}")
+        chat_history = self.get_message_history(session_id)
+        chunks = self.chain(self.select_prompt(context)).stream(
+            {"question": query, "context": context, "history": chat_history.messages}
+        )
+
+        def saved_chunks():
+            parts = []
+            for chunk in chunks:
+                parts.append(chunk.content if hasattr(chunk, "content") else chunk)
+                yield chunk
+            chat_history.add_messages([HumanMessage(content=query), AIMessage(content="".join(part for part in parts if isinstance(part, str)))])
+
+        return self.stream_text(saved_chunks(), {} if metrics is None else metrics)
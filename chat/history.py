@@ -0,0 +1,304 @@
+from langchain_community.chat_message_histories import SQLChatMessageHistory
+from langchain_community.chat_message_histories.sql import DefaultMessageConverter
+from langchain_core.messages import SystemMessage
+from sqlalchemy import Column, Index, Integer, Text, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from config.config import Config
+from utils.logger import get_logger
+from utils.tokens import count_tokens
+from utils.registry import registry
+import threading
+import atexit
+import queue
+import time
+
+logger = get_logger(__name__)
+
+MESSAGE_TABLE = "message_store"
+
+SummaryBase = declarative_base()
+
+class ChatSummary(SummaryBase):
+    """Rolling summary of a session's turns up to and including message id through_id."""
+
+    __tablename__ = "message_summaries"
+    session_id = Column(Text, primary_key=True)
+    summary = Column(Text, nullable=False)
+    through_id = Column(Integer, nullable=False)
+
+
+class HistoryStore:
+    """Process-wide chat history backend for one database URI.
+
+    Owns a pooled SQLAlchemy engine (WAL mode for SQLite), creates the schema
+    and the session_id index once, and appends messages through a write-behind
+    queue that a background thread flushes in batched transactions.
+    """
+
+    def __init__(self, uri, pool_size=Config.HISTORY_POOL_SIZE, batch_size=Config.HISTORY_WRITE_BATCH, flush_ms=Config.HISTORY_FLUSH_MS):
+        self.uri = uri
+        self.batch_size = batch_size
+        self.flush_window = flush_ms / 1000
+        self.engine = self._create_engine(uri, pool_size)
+        self.converter = DefaultMessageConverter(MESSAGE_TABLE)
+
+        model = self.converter.get_sql_model_class()
+        model.metadata.create_all(self.engine)
+        SummaryBase.metadata.create_all(self.engine)
+        Index(f"idx_{MESSAGE_TABLE}_session_id", model.session_id, model.id).create(self.engine, checkfirst=True)
+
+        self.appended = 0
+        self.flushes = 0
+        self._queue = queue.Queue()
+        self._pending = Counter()
+        self._flushed = threading.Condition()
+        self._callbacks = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-summary")
+        threading.Thread(target=self._write_behind, name="history-writer", daemon=True).start()
+
+    @staticmethod
+    def _create_engine(uri, pool_size):
+        url = make_url(uri)
+        if url.get_backend_name() != "sqlite":
+            return create_engine(uri, pool_size=pool_size, pool_pre_ping=True, pool_recycle=3600)
+        if url.database in (None, "", ":memory:"):
+            # One shared connection, so the write-behind thread and readers see the same in-memory database.
+            return create_engine(uri, poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+        engine = create_engine(uri, pool_size=pool_size, connect_args={"check_same_thread": False, "timeout": 30})
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=30000")
+            cursor.close()
+
+        return engine
+
+    def append(self, session_id, messages, callback=None):
+        """Queue messages for a session; callback runs after they are committed."""
+        rows = [self.converter.to_sql_model(message, session_id) for message in messages]
+        with self._flushed:
+            self._pending[session_id] += 1
+        self._queue.put((session_id, rows, callback))
+
+    def _write_behind(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                with Session(self.engine) as session:
+                    session.add_all([row for _, rows, _ in batch for row in rows])
+                    session.commit()
+                self.appended += sum(len(rows) for _, rows, _ in batch)
+                self.flushes += 1
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} chat history appends: {e}")
+
+            with self._flushed:
+                for session_id, _, _ in batch:
+                    self._pending[session_id] -= 1
+                    if not self._pending[session_id]:
+                        del self._pending[session_id]
+                self._flushed.notify_all()
+            for _, _, callback in batch:
+                if callback is not None:
+                    self._callbacks.submit(callback)
+
+    def wait(self, session_id=None, timeout=None):
+        """Block until queued appends (for one session, or all) are committed."""
+        with self._flushed:
+            return self._flushed.wait_for(lambda: not (self._pending[session_id] if session_id else self._pending), timeout)
+
+    def stats(self):
+        return {"appended": self.appended, "flushes": self.flushes, "pending": sum(self._pending.values())}
+
+
+def open_history_store(uri=None):
+    """Return the process-wide HistoryStore for a URI, creating it on first use."""
+    uri = uri or Config.CHAT_HISTORY_DB_URI
+    return registry.get("history_store", uri, lambda: HistoryStore(uri), evict=False)
+
+
+@atexit.register
+def _flush_stores():
+    for store in registry.values("history_store"):
+        store.wait(timeout=10)
+
+
+class BoundedChatMessageHistory(SQLChatMessageHistory):
+    """SQL chat history that loads only a bounded window of recent messages.
+
+    The window is the last max_turns turns that fit in max_tokens, read with a
+    LIMIT query instead of fetching the whole session. Messages that fall out of
+    the window are folded into a persisted rolling summary by the summarizer,
+    once summary_batch of them have accumulated, and the summary is prepended to
+    the window as a system message. Appends go through the store's write-behind
+    queue; reads wait for the session's own pending appends.
+    """
+
+    def __init__(self, session_id, summarizer=None, store=None, max_turns=Config.HISTORY_MAX_TURNS, max_tokens=Config.HISTORY_MAX_TOKENS,
+                 summary_batch=Config.HISTORY_SUMMARY_BATCH):
+        self.store = store or open_history_store()
+        super().__init__(session_id=session_id, connection=self.store.engine, custom_message_converter=self.store.converter)
+        self.summarizer = summarizer
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summary_batch = summary_batch
+
+    def _create_table_if_not_exists(self):
+        # The store created the schema once for its engine.
+        self._table_created = True
+
+    def _recent_records(self, limit):
+        self.store.wait(self.session_id)
+        model = self.sql_model_class
+        with self._make_sync_session() as session:
+            records = (
+                session.query(model)
+                .where(getattr(model, self.session_id_field_name) == self.session_id)
+                .order_by(model.id.desc())
+                .limit(limit)
+                .all()
+            )
+        return [(record.id, self.converter.from_sql_model(record)) for record in reversed(records)]
+
+    def _summary(self):
+        with self._make_sync_session() as session:
+            row = session.get(ChatSummary, self.session_id)
+            return (row.summary, row.through_id) if row else (None, 0)
+
+    def _window(self, summary=None):
+        """The newest messages within max_turns turns and the token budget left after the summary."""
+        budget = self.max_tokens - (count_tokens(summary) if summary else 0)
+        window = []
+        for message_id, message in reversed(self._recent_records(self.max_turns * 2)):
+            budget -= count_tokens(message.content if isinstance(message.content, str) else str(message.content))
+            if budget < 0:
+                break
+            window.append((message_id, message))
+        return window[::-1]
+
+    def recent_messages(self, limit):
+        """The last limit messages of the session, without the summary."""
+        return [message for _, message in self._recent_records(limit)]
+
+    @property
+    def messages(self):
+        summary, _ = self._summary()
+        window = [message for _, message in self._window(summary)]
+        logger.debug(f"Loaded {len(window)} history messages for session {self.session_id} (summary: {summary is not None}).")
+        if summary:
+            return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"), *window]
+        return window
+
+    def add_message(self, message):
+        self.add_messages([message])
+
+    def add_messages(self, messages):
+        self.store.append(self.session_id, list(messages), self.fold_summary if self.summarizer else None)
+
+    def fold_summary(self):
+        """Fold messages that have left the window into the rolling summary."""
+        if self.summarizer is None:
+            return
+        summary, through_id = self._summary()
+        window = self._window(summary)
+        if not window:
+            return
+        window_start = window[0][0]
+
+        model = self.sql_model_class
+        with self._make_sync_session() as session:
+            records = (
+                session.query(model)
+                .where(getattr(model, self.session_id_field_name) == self.session_id)
+                .where(model.id > through_id, model.id < window_start)
+                .order_by(model.id.asc())
+                .all()
+            )
+            evicted = [(record.id, self.converter.from_sql_model(record)) for record in records]
+        if len(evicted) < self.summary_batch:
+            return
+
+        try:
+            summary = self.summarizer(summary, [message for _, message in evicted])
+        except Exception as e:
+            logger.warning(f"Could not summarize history for session {self.session_id}: {e}")
+            return
+
+        with self._make_sync_session() as session:
+            session.merge(ChatSummary(session_id=self.session_id, summary=summary, through_id=evicted[-1][0]))
+            session.commit()
+        logger.info(f"Folded {len(evicted)} messages into the summary for session {self.session_id}.")
+
+    def clear(self):
+        self.store.wait(self.session_id)
+        super().clear()
+        with self._make_sync_session() as session:
+            session.query(ChatSummary).where(ChatSummary.session_id == self.session_id).delete()
+            session.commit()
+
+
+if __name__ == "__main__":
+    from langchain_core.messages import HumanMessage, AIMessage
+    import statistics
+    import tempfile
+    import os
+
+    # Multi-session concurrency benchmark: python -m chat.history
+    SESSIONS = 32
+    TURNS = 20
+
+    def run(label, open_history):
+        latencies, errors = [], []
+
+        def session_worker(session_number):
+            for turn in range(TURNS):
+                start = time.perf_counter()
+                try:
+                    history = open_history(f"{label}-{session_number}")
+                    history.messages
+                    history.add_messages([
+                        HumanMessage(content=f"Question {turn} from session {session_number} about award eligibility."),
+                        AIMessage(content=f"Answer {turn}: small businesses and acquisition teams may be nominated. " * 3),
+                    ])
+                except Exception as e:
+                    errors.append(str(e))
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        workers = [threading.Thread(target=session_worker, args=(number,)) for number in range(SESSIONS)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        locked = sum("locked" in error for error in errors)
+        print(f"{label:>10}: {SESSIONS * TURNS} turns in {elapsed:.2f}s, p50 {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, errors {len(errors)} (database is locked: {locked})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite:///{os.path.join(directory, 'chat_history.db')}"
+        run("per-turn", lambda session_id: SQLChatMessageHistory(session_id=session_id, connection=uri))
+
+        store = open_history_store(uri)
+        run("pooled", lambda session_id: BoundedChatMessageHistory(session_id, store=store))
+        store.wait()
+        print(f"Write-behind: {store.stats()}")
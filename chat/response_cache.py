@@ -0,0 +1,120 @@
+from collections import OrderedDict, deque
+from config.config import Config
+from utils.logger import get_logger
+import numpy as np
+import threading
+import time
+
+logger = get_logger(__name__)
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+class ResponseCache:
+    """Semantic cache of generated answers, matched by query-embedding cosine similarity.
+
+    Entries are scoped to a namespace (collection, chat model, filter) and to the
+    collection generation they were produced from, so a re-ingest invalidates them.
+    Each scope keeps its unit vectors in one matrix, so a lookup is a single
+    matrix-vector product; stores replace the matrix, so lookups score a snapshot
+    outside the lock.
+    """
+
+    def __init__(self, similarity_threshold, ttl_seconds, max_entries):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._created = deque()
+        self._scopes = {}
+        self._lock = threading.Lock()
+        self._next_key = 0
+
+    @staticmethod
+    def namespace(collection_name, chat_model, filter, retrieval="vector", diversify=False):
+        """Everything besides the question that changes the answer."""
+        return (collection_name, chat_model.model_name, chat_model.temperature, chat_model.max_tokens, repr(filter), retrieval, diversify)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        keys, matrix = self._scopes[entry["scope"]]
+        if len(keys) == 1:
+            del self._scopes[entry["scope"]]
+            return
+        position = keys.index(key)
+        self._scopes[entry["scope"]] = (keys[:position] + keys[position + 1:], np.delete(matrix, position, axis=0))
+
+    def _expire(self, now):
+        # Keys are created in order, so expired entries are always at the front.
+        while self._created and now - self._created[0][0] > self.ttl_seconds:
+            _, key = self._created.popleft()
+            if key in self._entries:
+                self._remove(key)
+
+    def lookup(self, namespace, generation, query_embedding):
+        """Return the stored response for the most similar live question, or None."""
+        query = _unit(query_embedding)
+        with self._lock:
+            self._expire(time.time())
+            keys, matrix = self._scopes.get((namespace, generation), ((), None))
+
+        best_key, best_similarity = None, self.similarity_threshold
+        if matrix is not None:
+            similarities = matrix @ query
+            position = int(np.argmax(similarities))
+            if similarities[position] >= best_similarity:
+                best_key, best_similarity = keys[position], float(similarities[position])
+
+        with self._lock:
+            if best_key is None or best_key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            logger.info(f"Response cache hit (similarity {best_similarity:.4f}), {self.hits} hits / {self.misses} misses.")
+            return self._entries[best_key]["response"]
+
+    def store(self, namespace, generation, query_embedding, response):
+        vector = _unit(query_embedding)[np.newaxis]
+        scope = (namespace, generation)
+        now = time.time()
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = {"scope": scope, "response": response}
+            self._created.append((now, key))
+            keys, matrix = self._scopes.get(scope, ((), None))
+            self._scopes[scope] = (keys + (key,), vector if matrix is None else np.vstack([matrix, vector]))
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._expire(now)
+
+
+response_cache = ResponseCache(
+    similarity_threshold=Config.RESPONSE_CACHE_SIMILARITY,
+    ttl_seconds=Config.RESPONSE_CACHE_TTL,
+    max_entries=Config.RESPONSE_CACHE_SIZE
+)
+
+
+if __name__ == "__main__":
+    import random
+
+    # Lookup latency with a full cache of 768-dimensional query embeddings: python -m chat.response_cache
+    random.seed(0)
+    cache = ResponseCache(similarity_threshold=0.95, ttl_seconds=3600, max_entries=512)
+    namespace = ("collection", "chat-model", 0.1, 1024, "None", "vector", False)
+    embeddings = [[random.gauss(0, 1) for _ in range(768)] for _ in range(cache.max_entries)]
+    for number, embedding in enumerate(embeddings):
+        cache.store(namespace, 1, embedding, f"Answer {number}")
+
+    queries = [[value + random.gauss(0, 0.01) for value in embedding] for embedding in embeddings]
+    start = time.perf_counter()
+    for query in queries:
+        cache.lookup(namespace, 1, query)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f"{cache.max_entries} entries: {elapsed * 1000:.3f} ms per lookup, {cache.hits} hits / {cache.misses} misses")
@@ -9,6 +9,17 @@ class Config:
     BATCH_SIZE = int(os.getenv("BATCH_SIZE"))
     FILTER_URLS = bool(os.getenv("FILTER_URLS"))
     FILTER_PATTERN = os.getenv("FILTER_PATTERN")
+    FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "16"))
+    FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "8"))
+    FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "30"))
+    CLEAN_WORKERS = int(os.getenv("CLEAN_WORKERS", str(os.cpu_count() or 1)))
+    FETCH_STAGE_WORKERS = int(os.getenv("FETCH_STAGE_WORKERS", "2"))
+    CLEAN_STAGE_WORKERS = int(os.getenv("CLEAN_STAGE_WORKERS", "1"))
+    STORE_STAGE_WORKERS = int(os.getenv("STORE_STAGE_WORKERS", "1"))
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+    MANIFEST_SAVE_EVERY = int(os.getenv("MANIFEST_SAVE_EVERY", "20"))
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "400"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
 
     CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH")
     CHROMA_DB_COLLECTION = os.getenv("CHROMA_DB_COLLECTION")
@@ -19,6 +30,34 @@ class Config:
     GEMINI_EMBEDDING_MODEL = os.getenv("GEMINI_EMBEDDING_MODEL")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./temp/embedding_cache.sqlite3")
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+    QUERY_CACHE_ON_DISK = os.getenv("QUERY_CACHE_ON_DISK", "true").lower() == "true"
+    RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.95"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    DEFAULT_RETRIEVAL = os.getenv("DEFAULT_RETRIEVAL", "vector")
+    HYBRID_FETCH_K = int(os.getenv("HYBRID_FETCH_K", "20"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "8"))
+    MMR_ENABLED = os.getenv("MMR_ENABLED", "false").lower() == "true"
+    MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.5"))
+    MMR_FETCH_K = int(os.getenv("MMR_FETCH_K", "50"))
+    KEYWORD_FETCH_FACTOR = int(os.getenv("KEYWORD_FETCH_FACTOR", "4"))
+    CONTEXT_WINDOW_TOKENS = int(os.getenv("CONTEXT_WINDOW_TOKENS", "8192"))
+    CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "3000"))
+    CONTEXT_MIN_TOKENS = int(os.getenv("CONTEXT_MIN_TOKENS", "256"))
+    CONTEXT_DEDUP_SIMILARITY = float(os.getenv("CONTEXT_DEDUP_SIMILARITY", "0.8"))
+    CONTEXT_MAX_SENTENCES = int(os.getenv("CONTEXT_MAX_SENTENCES", "6"))
+    SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8600"))
+    SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "16"))
+    QUERY_BATCH_WINDOW_MS = float(os.getenv("QUERY_BATCH_WINDOW_MS", "5"))
+    QUERY_BATCH_MAX_SIZE = int(os.getenv("QUERY_BATCH_MAX_SIZE", "64"))
+
     GEMINI_CHAT_MODEL = os.getenv("GEMINI_CHAT_MODEL")
     LLAMA_CHAT_MODEL = os.getenv("LLAMA_CHAT_MODEL")
 
@@ -29,6 +68,12 @@ class Config:
     DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS"))
     
     CHAT_HISTORY_DB_URI = os.getenv("CHAT_HISTORY_DB_URI")
+    HISTORY_MAX_TURNS = int(os.getenv("HISTORY_MAX_TURNS", "6"))
+    HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", "1500"))
+    HISTORY_SUMMARY_BATCH = int(os.getenv("HISTORY_SUMMARY_BATCH", "4"))
+    HISTORY_POOL_SIZE = int(os.getenv("HISTORY_POOL_SIZE", "8"))
+    HISTORY_WRITE_BATCH = int(os.getenv("HISTORY_WRITE_BATCH", "64"))
+    HISTORY_FLUSH_MS = float(os.getenv("HISTORY_FLUSH_MS", "10"))
 
     SCORE_THRESHOLD = float(os.getenv("SCORE_THRESHOLD"))
 
@@ -41,6 +86,17 @@ class Config:
         print(f" BATCH_SIZE: {Config.BATCH_SIZE}")
         print(f" FILTER_URLS: {Config.FILTER_URLS}")
         print(f" FILTER_PATTERN: {Config.FILTER_PATTERN}")
+        print(f" FETCH_CONCURRENCY: {Config.FETCH_CONCURRENCY}")
+        print(f" FETCH_PER_HOST_LIMIT: {Config.FETCH_PER_HOST_LIMIT}")
+        print(f" FETCH_TIMEOUT: {Config.FETCH_TIMEOUT}")
+        print(f" CLEAN_WORKERS: {Config.CLEAN_WORKERS}")
+        print(f" FETCH_STAGE_WORKERS: {Config.FETCH_STAGE_WORKERS}")
+        print(f" CLEAN_STAGE_WORKERS: {Config.CLEAN_STAGE_WORKERS}")
+        print(f" STORE_STAGE_WORKERS: {Config.STORE_STAGE_WORKERS}")
+        print(f" PIPELINE_QUEUE_SIZE: {Config.PIPELINE_QUEUE_SIZE}")
+        print(f" MANIFEST_SAVE_EVERY: {Config.MANIFEST_SAVE_EVERY}")
+        print(f" CHUNK_SIZE: {Config.CHUNK_SIZE}")
+        print(f" CHUNK_OVERLAP: {Config.CHUNK_OVERLAP}")
 
         print(f" CHROMA_DB_PATH: {Config.CHROMA_DB_PATH}")
         print(f" CHROMA_DB_COLLECTION: {Config.CHROMA_DB_COLLECTION}")
@@ -51,6 +107,34 @@ class Config:
         print(f" GEMINI_EMBEDDING_MODEL: {Config.GEMINI_EMBEDDING_MODEL}")
         print(f" GEMINI_API_KEY Set: {'Yes' if Config.GEMINI_API_KEY else 'No'}")
 
+        print(f" EMBEDDING_BATCH_SIZE: {Config.EMBEDDING_BATCH_SIZE}")
+        print(f" EMBEDDING_CONCURRENCY: {Config.EMBEDDING_CONCURRENCY}")
+        print(f" EMBEDDING_CACHE_PATH: {Config.EMBEDDING_CACHE_PATH}")
+        print(f" EMBEDDING_CACHE_MAX_ENTRIES: {Config.EMBEDDING_CACHE_MAX_ENTRIES}")
+        print(f" QUERY_CACHE_SIZE: {Config.QUERY_CACHE_SIZE}")
+        print(f" QUERY_CACHE_ON_DISK: {Config.QUERY_CACHE_ON_DISK}")
+        print(f" RESPONSE_CACHE_SIMILARITY: {Config.RESPONSE_CACHE_SIMILARITY}")
+        print(f" RESPONSE_CACHE_TTL: {Config.RESPONSE_CACHE_TTL}")
+        print(f" RESPONSE_CACHE_SIZE: {Config.RESPONSE_CACHE_SIZE}")
+        print(f" DEFAULT_RETRIEVAL: {Config.DEFAULT_RETRIEVAL}")
+        print(f" HYBRID_FETCH_K: {Config.HYBRID_FETCH_K}")
+        print(f" RRF_K: {Config.RRF_K}")
+        print(f" RETRIEVAL_WORKERS: {Config.RETRIEVAL_WORKERS}")
+        print(f" MMR_ENABLED: {Config.MMR_ENABLED}")
+        print(f" MMR_LAMBDA: {Config.MMR_LAMBDA}")
+        print(f" MMR_FETCH_K: {Config.MMR_FETCH_K}")
+        print(f" KEYWORD_FETCH_FACTOR: {Config.KEYWORD_FETCH_FACTOR}")
+        print(f" CONTEXT_WINDOW_TOKENS: {Config.CONTEXT_WINDOW_TOKENS}")
+        print(f" CONTEXT_MAX_TOKENS: {Config.CONTEXT_MAX_TOKENS}")
+        print(f" CONTEXT_MIN_TOKENS: {Config.CONTEXT_MIN_TOKENS}")
+        print(f" CONTEXT_DEDUP_SIMILARITY: {Config.CONTEXT_DEDUP_SIMILARITY}")
+        print(f" CONTEXT_MAX_SENTENCES: {Config.CONTEXT_MAX_SENTENCES}")
+        print(f" SERVICE_HOST: {Config.SERVICE_HOST}")
+        print(f" SERVICE_PORT: {Config.SERVICE_PORT}")
+        print(f" SERVICE_WORKERS: {Config.SERVICE_WORKERS}")
+        print(f" QUERY_BATCH_WINDOW_MS: {Config.QUERY_BATCH_WINDOW_MS}")
+        print(f" QUERY_BATCH_MAX_SIZE: {Config.QUERY_BATCH_MAX_SIZE}")
+
         print(f" GEMINI_CHAT_MODEL: {Config.GEMINI_CHAT_MODEL}")
         print(f" LLAMA_CHAT_MODEL: {Config.LLAMA_CHAT_MODEL}")
 
@@ -61,6 +145,12 @@ class Config:
         print(f" DEFAULT_MAX_TOKENS: {Config.DEFAULT_MAX_TOKENS}")
 
         print(f" CHAT_HISTORY_DB_URI: {Config.CHAT_HISTORY_DB_URI}")
+        print(f" HISTORY_MAX_TURNS: {Config.HISTORY_MAX_TURNS}")
+        print(f" HISTORY_MAX_TOKENS: {Config.HISTORY_MAX_TOKENS}")
+        print(f" HISTORY_SUMMARY_BATCH: {Config.HISTORY_SUMMARY_BATCH}")
+        print(f" HISTORY_POOL_SIZE: {Config.HISTORY_POOL_SIZE}")
+        print(f" HISTORY_WRITE_BATCH: {Config.HISTORY_WRITE_BATCH}")
+        print(f" HISTORY_FLUSH_MS: {Config.HISTORY_FLUSH_MS}")
 
         print(f" SCORE_THRESHOLD: {Config.SCORE_THRESHOLD}")
 
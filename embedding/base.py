@@ -1,3 +1,6 @@
+from embedding.cache import CachedEmbeddings, open_cache
+from embedding.batching import BatchedEmbeddings
+from config.config import Config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -8,6 +11,24 @@ class BaseEmbedding:
     def __init__(self, model_name):
         self.model_name = model_name
         self.model = None
+        self.base_model = None
+
+    def wrap_model(self, model):
+        """Wrap a LangChain embedding model with batching and, outermost, the embedding cache; the unwrapped model is kept as base_model."""
+        self.base_model = model
+        return self.with_cache(self.with_batching(model))
+
+    def with_batching(self, model):
+        """Wrap a LangChain embedding model so documents are embedded in concurrent, adaptive batches."""
+        return BatchedEmbeddings(model, batch_size=Config.EMBEDDING_BATCH_SIZE, max_concurrency=Config.EMBEDDING_CONCURRENCY)
+
+    def with_cache(self, model):
+        """Wrap a LangChain embedding model with the persistent embedding cache, if one is configured."""
+        if not Config.EMBEDDING_CACHE_PATH:
+            return model
+        cache = open_cache(Config.EMBEDDING_CACHE_PATH, Config.EMBEDDING_CACHE_MAX_ENTRIES)
+        logger.info(f"Embedding cache enabled at {Config.EMBEDDING_CACHE_PATH} for '{self.model_name}'.")
+        return CachedEmbeddings(model, self.model_name, cache)
     
     def generate_embedding(self, text):
         """Generate an embedding for a single piece of text."""
@@ -18,4 +39,29 @@ class BaseEmbedding:
             return embedding[0] if embedding else None
         except Exception as e:
             logger.error(f"Error generating embedding with {self.model_name}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def generate_embeddings(self, texts):
+        """Generate embeddings for many texts in batched, concurrent requests."""
+        try:
+            if not self.model:
+                self.initialize_model()
+            return self.model.embed_documents(list(texts))
+        except Exception as e:
+            logger.error(f"Error generating embeddings with {self.model_name}: {e}")
+            return None
+
+    async def agenerate_embedding(self, text):
+        """Async generate_embedding."""
+        embeddings = await self.agenerate_embeddings([text])
+        return embeddings[0] if embeddings else None
+
+    async def agenerate_embeddings(self, texts):
+        """Async generate_embeddings, awaiting the model's async embedding call."""
+        try:
+            if not self.model:
+                self.initialize_model()
+            return await self.model.aembed_documents(list(texts))
+        except Exception as e:
+            logger.error(f"Error generating embeddings with {self.model_name}: {e}")
+            return None
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.embeddings import Embeddings
+from utils.logger import get_logger
+import threading
+
+logger = get_logger(__name__)
+
+def _is_timeout(error):
+    """True when an error (or its cause) is a client or server timeout."""
+    while error is not None:
+        name = type(error).__name__.lower()
+        if isinstance(error, TimeoutError) or "timeout" in name or "deadline" in name:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class BatchedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that embeds documents in concurrent, adaptively sized batches.
+
+    A timed-out batch is split in half and retried, and the batch size shrinks; it
+    grows back towards the configured size as batches succeed again.
+    """
+
+    def __init__(self, embeddings, batch_size, max_concurrency, min_batch_size=1):
+        self.embeddings = embeddings
+        self.max_batch_size = batch_size
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embed")
+        self._lock = threading.Lock()
+
+    def _shrink(self, failed_size):
+        with self._lock:
+            self.batch_size = max(self.min_batch_size, min(self.batch_size, failed_size // 2))
+            logger.warning(f"Embedding batch of {failed_size} timed out, batch size reduced to {self.batch_size}.")
+
+    def _grow(self):
+        with self._lock:
+            if self.batch_size < self.max_batch_size:
+                self.batch_size = min(self.max_batch_size, self.batch_size + max(1, self.max_batch_size // 8))
+
+    def _embed_batch(self, texts):
+        try:
+            vectors = self.embeddings.embed_documents(texts)
+        except Exception as e:
+            if not _is_timeout(e) or len(texts) <= self.min_batch_size:
+                raise
+            self._shrink(len(texts))
+            half = len(texts) // 2
+            return self._embed_batch(texts[:half]) + self._embed_batch(texts[half:])
+        self._grow()
+        return vectors
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        size = self.batch_size
+        batches = [texts[start:start + size] for start in range(0, len(texts), size)]
+        if len(batches) <= 1:
+            return self._embed_batch(texts) if texts else []
+
+        vectors = []
+        for batch_vectors in self.executor.map(self._embed_batch, batches):
+            vectors.extend(batch_vectors)
+        return vectors
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text):
+        return await self.embeddings.aembed_query(text)
+
+
+if __name__ == "__main__":
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from langchain_ollama import OllamaEmbeddings
+    import json
+    import time
+
+    REQUEST_OVERHEAD = 0.03
+    PER_TEXT_COST = 0.001
+    TOTAL_TEXTS = 512
+
+    class FakeOllamaHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+            time.sleep(REQUEST_OVERHEAD + PER_TEXT_COST * len(inputs))
+            body = json.dumps({"model": payload["model"], "embeddings": [[float(len(text)), 1.0, 0.0] for text in inputs]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = OllamaEmbeddings(model="fake-embed", base_url=f"http://127.0.0.1:{server.server_port}")
+    texts = [f"document number {i}" for i in range(TOTAL_TEXTS)]
+
+    for batch_size, concurrency in [(1, 1), (8, 1), (32, 1), (8, 4), (32, 4), (32, 8)]:
+        embeddings = BatchedEmbeddings(client, batch_size=batch_size, max_concurrency=concurrency)
+        start = time.perf_counter()
+        embeddings.embed_documents(texts)
+        elapsed = time.perf_counter() - start
+        print(f"batch_size={batch_size:>3}  concurrency={concurrency:>2}  {TOTAL_TEXTS / elapsed:8.1f} texts/sec")
+
+    server.shutdown()
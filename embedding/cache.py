@@ -0,0 +1,147 @@
+from langchain_core.embeddings import Embeddings
+from utils.logger import get_logger
+from utils.registry import registry
+from array import array
+import threading
+import hashlib
+import sqlite3
+import time
+import os
+import re
+
+logger = get_logger(__name__)
+
+SQL_BATCH = 500
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different copies of a text share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip()
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding store keyed by (model name, normalized-text hash) with LRU eviction."""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self.connection.commit()
+        # Running entry count, so writes and stats never scan the table.
+        self.entries = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model, hashes):
+        """Return {hash: vector} for the hashes present in the cache and mark them recently used."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), SQL_BATCH):
+                batch = hashes[start:start + SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = array("f", blob).tolist()
+
+            if found:
+                now = time.time()
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, digest) for digest in found]
+                )
+                self.connection.commit()
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model, vectors):
+        """Store {hash: vector} and evict the least recently used entries beyond max_entries."""
+        now = time.time()
+        hashes = list(vectors)
+        with self._lock:
+            existing = 0
+            for start in range(0, len(hashes), SQL_BATCH):
+                batch = hashes[start:start + SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                existing += self.connection.execute(
+                    f"SELECT COUNT(*) FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchone()[0]
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(model, digest, array("f", vector).tobytes(), now) for digest, vector in vectors.items()]
+            )
+            self.entries += len(hashes) - existing
+            overflow = self.entries - self.max_entries
+            if overflow > 0:
+                evicted = self.connection.execute(
+                    "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+                self.entries -= evicted
+                logger.info(f"Evicted {evicted} least recently used embeddings from the cache.")
+            self.connection.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": self.entries,
+            }
+
+
+def open_cache(path, max_entries):
+    """Return the process-wide EmbeddingCache for a path, creating it on first use."""
+    return registry.get("embedding_cache", path, lambda: EmbeddingCache(path, max_entries), evict=False)
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that serves previously embedded documents from an EmbeddingCache."""
+
+    def __init__(self, embeddings, model_name, cache):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        hashes = [text_hash(text) for text in texts]
+        cached = self.cache.get_many(self.model_name, list(set(hashes)))
+
+        missing = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in cached and digest not in missing:
+                missing[digest] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_name, computed)
+            cached.update(computed)
+
+        logger.debug(f"Embedding cache for '{self.model_name}': computed {len(missing)} of {len(texts)} embeddings.")
+        return [cached[digest] for digest in hashes]
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text):
+        return await self.embeddings.aembed_query(text)
@@ -15,7 +15,7 @@ class GeminiEmbeddingGenerator(BaseEmbedding):
         if "GOOGLE_API_KEY" not in os.environ:
             os.environ["GOOGLE_API_KEY"] = Config.GEMINI_API_KEY
         try:
-            self.model = GoogleGenerativeAIEmbeddings(model=f"models/{Config.GEMINI_EMBEDDING_MODEL}")
+            self.model = self.wrap_model(GoogleGenerativeAIEmbeddings(model=f"models/{Config.GEMINI_EMBEDDING_MODEL}"))
         except Exception as e:
             logger.error(f"Error initializing GeminiEmbeddingGenerator: {e}")
         
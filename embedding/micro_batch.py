@@ -0,0 +1,86 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from langchain_core.embeddings import Embeddings
+from config.config import Config
+from utils.logger import get_logger
+import threading
+import inspect
+import queue
+import time
+
+logger = get_logger(__name__)
+
+QUERY_TASK_TYPE = "RETRIEVAL_QUERY"
+
+class MicroBatchEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that coalesces concurrent embed_query calls into micro-batches.
+
+    Queries arriving within window_ms of the first waiting query are embedded
+    together in one batched call to query_embeddings, so the embedding server sees
+    fewer, larger requests. query_embeddings should be the raw model rather than a
+    caching wrapper, so query vectors never land in the document cache; it
+    defaults to embeddings. Documents pass straight through to embeddings.
+    """
+
+    def __init__(self, embeddings, query_embeddings=None, window_ms=Config.QUERY_BATCH_WINDOW_MS, max_batch_size=Config.QUERY_BATCH_MAX_SIZE,
+                 max_concurrency=Config.EMBEDDING_CONCURRENCY):
+        self.embeddings = embeddings
+        self.query_embeddings = query_embeddings or embeddings
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.requests = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="query-embed")
+        threading.Thread(target=self._collect, name="query-batcher", daemon=True).start()
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._embed_batch, batch)
+
+    def _embed_queries(self, texts):
+        """Embed several queries as embed_query would; Gemini needs the RETRIEVAL_QUERY task type for its batch call."""
+        if "task_type" in inspect.signature(self.query_embeddings.embed_documents).parameters:
+            task_type = getattr(self.query_embeddings, "task_type", None) or QUERY_TASK_TYPE
+            return self.query_embeddings.embed_documents(texts, task_type=task_type)
+        return self.query_embeddings.embed_documents(texts)
+
+    def _embed_batch(self, batch):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = dict(zip(texts, self._embed_queries(texts)))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+        for text, future in batch:
+            future.set_result(vectors[text])
+
+    def embed_query(self, text):
+        future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "average_batch_size": self.requests / self.batches if self.batches else 0.0,
+            }
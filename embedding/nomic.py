@@ -11,7 +11,7 @@ class NomicEmbeddingGenerator(BaseEmbedding):
     def __init__(self):
         super().__init__(Config.NOMIC_EMBEDDING_MODEL)
         try:
-            self.model = OllamaEmbeddings(model=self.model_name)
+            self.model = self.wrap_model(OllamaEmbeddings(model=self.model_name))
             logger.info(f"Nomic embedding model initialized successfully '{self.model}'.")
         except Exception as e:
             logger.error(f"Error initializing NomicEmbeddingGenerator: {e}")
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from embedding.cache import open_cache, text_hash
+from config.config import Config
+from utils.logger import get_logger
+import threading
+
+logger = get_logger(__name__)
+
+def normalize_query(query):
+    return " ".join(query.split()).lower()
+
+def embedding_model_name(embeddings):
+    """Best-effort model name for a (possibly wrapped) LangChain embedding object."""
+    while embeddings is not None:
+        name = getattr(embeddings, "model_name", None) or getattr(embeddings, "model", None)
+        if isinstance(name, str):
+            return name
+        embeddings = getattr(embeddings, "embeddings", None)
+    return "unknown"
+
+
+class QueryEmbeddingCache:
+    """In-process LRU of query embeddings, optionally shared on disk through the EmbeddingCache.
+
+    The disk cache at disk_path is opened on first use, not at import. Hits served
+    from disk count as hits and are also counted in disk_hits.
+    """
+
+    def __init__(self, max_entries, disk_path=None, disk_max_entries=0):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def disk_cache(self):
+        return open_cache(self.disk_path, self.disk_max_entries) if self.disk_path else None
+
+    def _lookup(self, model_name, normalized):
+        with self._lock:
+            key = (model_name, normalized)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], True
+
+        disk_cache = self.disk_cache
+        if disk_cache:
+            digest = text_hash(normalized)
+            return disk_cache.get_many(f"{model_name}#query", [digest]).get(digest), False
+        return None, False
+
+    def get_or_embed(self, model_name, query, embed_query):
+        """Return the cached embedding for a query, calling embed_query only on a miss."""
+        normalized = normalize_query(query)
+        vector, in_memory = self._lookup(model_name, normalized)
+        if in_memory:
+            return vector
+        computed = vector is None
+        if computed:
+            vector = embed_query(query)
+        return self._remember(model_name, normalized, vector, computed)
+
+    async def aget_or_embed(self, model_name, query, aembed_query):
+        """Async get_or_embed; awaits aembed_query only on a miss."""
+        normalized = normalize_query(query)
+        vector, in_memory = self._lookup(model_name, normalized)
+        if in_memory:
+            return vector
+        computed = vector is None
+        if computed:
+            vector = await aembed_query(query)
+        return self._remember(model_name, normalized, vector, computed)
+
+    def _remember(self, model_name, normalized, vector, computed):
+        key = (model_name, normalized)
+        disk_cache = self.disk_cache if computed else None
+        if disk_cache:
+            disk_cache.put_many(f"{model_name}#query", {text_hash(normalized): vector})
+
+        with self._lock:
+            if computed:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += 1
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+query_cache = QueryEmbeddingCache(
+    Config.QUERY_CACHE_SIZE,
+    disk_path=Config.EMBEDDING_CACHE_PATH if Config.QUERY_CACHE_ON_DISK else None,
+    disk_max_entries=Config.EMBEDDING_CACHE_MAX_ENTRIES
+)
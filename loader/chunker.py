@@ -0,0 +1,69 @@
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from utils.tokens import count_tokens
+from utils.logger import get_logger
+from config.config import Config
+
+logger = get_logger(__name__)
+
+HEADING_PREFIX = "## "
+
+class DocumentChunker:
+    """Token-aware chunker that prefers heading, then paragraph, then sentence boundaries."""
+
+    def __init__(self, chunk_size=Config.CHUNK_SIZE, chunk_overlap=Config.CHUNK_OVERLAP):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.splitter = RecursiveCharacterTextSplitter(
+            separators=[f"\n\n{HEADING_PREFIX}", "\n\n", "\n", r"(?<=[.!?]) ", " ", ""],
+            is_separator_regex=True,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=count_tokens,
+            keep_separator="start",
+        )
+
+    def split_documents(self, documents):
+        """Split cleaned page documents into chunks that keep the page metadata.
+
+        Chunks after the first in a section are prefixed with the section heading,
+        and a heading split off on its own (its section was longer than chunk_size)
+        is not stored as a chunk of its own.
+        """
+        chunks = []
+        for doc in documents:
+            section = ""
+            chunk_index = 0
+            for text in self.splitter.split_text(doc.page_content):
+                if text.startswith(HEADING_PREFIX):
+                    heading, _, body = text.partition("\n")
+                    section = heading[len(HEADING_PREFIX):].strip()
+                    if not body.strip():
+                        continue
+                elif section:
+                    text = f"{HEADING_PREFIX}{section}\n\n{text}"
+                chunks.append(Document(
+                    page_content=text,
+                    metadata={**doc.metadata, "chunk_index": chunk_index, "section": section}
+                ))
+                chunk_index += 1
+
+        logger.info(f"Split {len(documents)} documents into {len(chunks)} chunks.")
+        return chunks
+
+
+if __name__ == "__main__":
+    # Heading handling check: python -m loader.chunker
+    paragraph = " ".join(f"Nominees in category {i} must be small businesses with an active contract." for i in range(12))
+    page = Document(
+        page_content=f"## Awards\n\n{paragraph}\n\n## Deadlines\n\nNominations close on 1 May.",
+        metadata={"source": "https://example.com/awards"}
+    )
+    chunks = DocumentChunker(chunk_size=60, chunk_overlap=0).split_documents([page])
+    for chunk in chunks:
+        print(f"{chunk.metadata['chunk_index']:>2} [{chunk.metadata['section']}] {count_tokens(chunk.page_content):>3} tokens: {chunk.page_content[:60]!r}")
+
+    assert all(chunk.page_content.strip() != f"{HEADING_PREFIX}{chunk.metadata['section']}" for chunk in chunks), "heading-only chunk"
+    assert all(chunk.page_content.startswith(f"{HEADING_PREFIX}{chunk.metadata['section']}\n") for chunk in chunks), "chunk lost its heading"
+    assert [chunk.metadata["chunk_index"] for chunk in chunks] == list(range(len(chunks)))
+    print(f"{len(chunks)} chunks, each carrying its section heading.")
@@ -0,0 +1,96 @@
+from utils.logger import get_logger
+from config.config import Config
+import threading
+import hashlib
+import json
+import os
+
+logger = get_logger(__name__)
+
+class CrawlManifest:
+    """Persisted per-URL crawl state used to skip unchanged pages on re-runs.
+
+    With load=False the manifest starts empty and is rebuilt from the pages a full
+    re-crawl fetches, replacing the saved one.
+    """
+
+    def __init__(self, path, save_every=Config.MANIFEST_SAVE_EVERY, load=True):
+        self.path = path
+        self.save_every = save_every
+        self.entries = {}
+        self._unsaved_blocks = 0
+        self._lock = threading.Lock()
+        if load and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.entries = json.load(f)
+                logger.info(f"Loaded crawl manifest with {len(self.entries)} entries from {path}.")
+            except Exception as e:
+                logger.error(f"Error reading crawl manifest {path}, starting fresh: {e}")
+
+    @staticmethod
+    def path_for(persist_directory, collection_name):
+        """Crawl manifest location, kept next to the vector store collection."""
+        return os.path.join(persist_directory, f"{collection_name}_crawl_manifest.json")
+
+    @staticmethod
+    def remove(persist_directory, collection_name):
+        """Delete a collection's saved manifest, so the next crawl fetches every page again."""
+        path = CrawlManifest.path_for(persist_directory, collection_name)
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Removed crawl manifest {path}.")
+
+    @staticmethod
+    def content_hash(text):
+        """Hash cleaned page text so unchanged pages can be detected."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, url):
+        with self._lock:
+            return dict(self.entries.get(url, {}))
+
+    def is_fresh(self, element):
+        """True when the sitemap lastmod matches what was stored for this URL."""
+        entry = self.get(element["loc"].strip())
+        lastmod = element.get("lastmod")
+        return bool(lastmod) and entry.get("lastmod") == lastmod and "content_hash" in entry
+
+    def conditional_headers(self, url):
+        """Build If-None-Match / If-Modified-Since headers from the stored validators."""
+        entry = self.get(url)
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url, **fields):
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry.update({key: value for key, value in fields.items() if value is not None})
+
+    def forget(self, urls):
+        """Drop the entries for urls, so they are fetched and stored again."""
+        with self._lock:
+            for url in urls:
+                self.entries.pop(url, None)
+
+    def checkpoint(self):
+        """Record a stored block and save once save_every blocks have accumulated, instead of rewriting the manifest per block."""
+        with self._lock:
+            self._unsaved_blocks += 1
+            due = self._unsaved_blocks >= self.save_every
+        if due:
+            self.save()
+
+    def save(self):
+        """Write the manifest atomically next to the vector store."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self._unsaved_blocks = 0
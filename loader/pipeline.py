@@ -0,0 +1,143 @@
+from utils.logger import get_logger
+from config.config import Config
+import threading
+import queue
+import time
+
+logger = get_logger(__name__)
+
+_END = object()
+
+class Stage:
+    """A pipeline stage: a function applied to each item by a fixed number of worker threads."""
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+
+
+class IngestionPipeline:
+    """Run items through stages connected by bounded queues so the stages overlap.
+
+    A full queue blocks the stage feeding it, so a slow stage applies backpressure
+    all the way back to the sitemap reader instead of buffering unbounded work.
+    """
+
+    def __init__(self, stages, queue_size=Config.PIPELINE_QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._error = None
+
+    def _put(self, target, item):
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source):
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _fail(self, stage, error):
+        logger.error(f"Pipeline stage '{stage.name}' failed: {error}")
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _work(self, stage, source, target, remaining, lock):
+        try:
+            while True:
+                item = self._get(source)
+                if item is _END:
+                    self._put(source, _END)
+                    break
+
+                start = time.perf_counter()
+                try:
+                    result = stage.func(item)
+                except Exception as e:
+                    self._fail(stage, e)
+                    break
+                with lock:
+                    stage.items += 1
+                    stage.busy_seconds += time.perf_counter() - start
+
+                if target is not None and result is not None:
+                    self._put(target, result)
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last_worker = remaining[0] == 0
+            if last_worker and target is not None:
+                self._put(target, _END)
+
+    def run(self, items):
+        """Feed items through every stage and block until the last stage drains."""
+        self._stop.clear()
+        self._error = None
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            target = queues[index + 1] if index + 1 < len(self.stages) else None
+            remaining, lock = [stage.workers], threading.Lock()
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], target, remaining, lock),
+                    name=f"{stage.name}-{worker}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        start = time.perf_counter()
+        try:
+            for item in items:
+                if not self._put(queues[0], item):
+                    break
+        except Exception as e:
+            logger.error(f"Pipeline source failed: {e}")
+            self._error = e
+            self._stop.set()
+        self._put(queues[0], _END)
+
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        for stage in self.stages:
+            logger.info(f"Stage '{stage.name}' ({stage.workers} workers): {stage.items} items, {stage.busy_seconds:.2f}s busy.")
+        logger.info(f"Pipeline finished in {elapsed:.2f}s wall time.")
+
+        if self._error is not None:
+            raise self._error
+        return elapsed
+
+
+if __name__ == "__main__":
+    STAGE_SECONDS = {"fetch": 0.05, "clean": 0.03, "store": 0.04}
+    TOTAL_BLOCKS = 40
+
+    def make_stage(name):
+        def work(item):
+            time.sleep(STAGE_SECONDS[name])
+            return item
+        return Stage(name, work)
+
+    sequential = TOTAL_BLOCKS * sum(STAGE_SECONDS.values())
+    slowest = TOTAL_BLOCKS * max(STAGE_SECONDS.values())
+    pipeline = IngestionPipeline([make_stage(name) for name in STAGE_SECONDS], queue_size=4)
+    elapsed = pipeline.run(range(TOTAL_BLOCKS))
+    print(f"sequential {sequential:.2f}s  slowest stage {slowest:.2f}s  pipelined {elapsed:.2f}s")
@@ -1,82 +1,153 @@
-from langchain_community.document_loaders import SitemapLoader
-from bs4 import BeautifulSoup
+from loader.fetcher import PageFetcher
+from loader.urls import SitemapResolver
+from loader.manifest import CrawlManifest
+from loader.chunker import DocumentChunker
+from loader.cleaner import HtmlCleaner
+from loader.pipeline import IngestionPipeline, Stage
 from utils.logger import get_logger
 from config.config import Config
-import re
-import requests
+from collections import Counter
+import threading
 
 logger = get_logger(__name__)
 
 class Sitemap:
     """Class for loading sitemaps."""
-    def __init__(self, sitemap_url, vector_store, block_size, filter_urls, filter_pattern):
+    def __init__(self, sitemap_url, vector_store, block_size, filter_urls, filter_pattern, fetch_concurrency=Config.FETCH_CONCURRENCY, per_host_limit=Config.FETCH_PER_HOST_LIMIT, incremental=True, chunker=None, clean_workers=Config.CLEAN_WORKERS):
         self.sitemap_url = sitemap_url
         self.vector_store = vector_store
         self.block_size = block_size
         self.filter_urls = filter_urls
         self.filter_pattern = filter_pattern
+        self.fetch_concurrency = fetch_concurrency
+        self.per_host_limit = per_host_limit
+        self.incremental = incremental
+        self.chunker = chunker or DocumentChunker()
+        self.clean_workers = clean_workers
+        self.fetcher = None
+        self.cleaner = None
+        self.manifest = None
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def manifest_path(self):
+        """Crawl manifest location, kept next to the vector store collection."""
+        return CrawlManifest.path_for(self.vector_store.persist_directory, self.vector_store.collection_name)
+
+    def stages(self, fetch_workers=Config.FETCH_STAGE_WORKERS, clean_workers=Config.CLEAN_STAGE_WORKERS, store_workers=Config.STORE_STAGE_WORKERS):
+        """Fetch, clean and embed/store stages for an IngestionPipeline."""
+        return [
+            Stage("fetch", self.fetch_block, fetch_workers),
+            Stage("clean", self.clean_block, clean_workers),
+            Stage("store", self.store_block, store_workers),
+        ]
+
+    def _count(self, key, amount):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def fetch_block(self, block_elements):
+        """Fetch one block of sitemap elements, skipping pages the manifest says are unchanged."""
+        if self.incremental:
+            # Entries for pages with no chunks in the store (e.g. after the collection was deleted) must not skip them.
+            known = [element["loc"].strip() for element in block_elements if self.manifest.get(element["loc"].strip())]
+            if known:
+                missing = set(known) - self.vector_store.stored_sources(known)
+                if missing:
+                    logger.info(f"Ignoring crawl manifest entries for {len(missing)} pages missing from the store.")
+                    self.manifest.forget(missing)
+            stale_elements = [element for element in block_elements if not self.manifest.is_fresh(element)]
+            self._count("skipped", len(block_elements) - len(stale_elements))
+            block_elements = stale_elements
+
+        docs = self.fetcher.fetch_all(block_elements, self.manifest)
+        logger.info(f"Loaded {len(docs)} documents from a block of {len(block_elements)} URLs.")
+
+        for doc in docs:
+            if doc.metadata.get("not_modified"):
+                self.manifest.update(doc.metadata["source"], lastmod=doc.metadata.get("lastmod"))
+                self._count("not_modified", 1)
+        docs = [doc for doc in docs if not doc.metadata.get("not_modified")]
+        return docs
+
+    def clean_block(self, docs):
+        """Clean fetched pages, attach topic metadata and drop pages whose text is unchanged."""
+        clean_texts = self.cleaner.clean_all([doc.page_content for doc in docs])
+
+        for doc, clean_text in zip(docs, clean_texts): 
+            doc.page_content = clean_text
+            doc.metadata["content_hash"] = CrawlManifest.content_hash(clean_text)
+            
+            source_url = doc.metadata.get("source", "")
+            parts = source_url.replace(self.sitemap_url.replace('/sitemap.xml', "/"), "").split("/")
+            topic = parts[0] if len(parts) > 0 else ""
+            subtopic = parts[1] if len(parts) > 1 else ""
+            doc.metadata["topic"] = topic
+            doc.metadata["subtopic"] = subtopic
+
+        validators = {}
+        for doc in docs:
+            validators[doc.metadata["source"]] = {
+                "lastmod": doc.metadata.get("lastmod"),
+                "etag": doc.metadata.pop("etag", None),
+                "last_modified": doc.metadata.pop("last_modified", None),
+                "content_hash": doc.metadata["content_hash"]
+            }
 
-    def load_records(self):
-        """Retrieve sitemaps in batches and store them."""
-        logger.info(f"Processing sitemap with url {self.sitemap_url}.")
-        
-        response = requests.get(self.sitemap_url)
-        sitemap_content = response.content
-        soup = BeautifulSoup(sitemap_content, "xml")
-
-        loader_kwargs = {"web_path": self.sitemap_url}
-        if self.filter_urls:
-            loader_kwargs["filter_urls"] = [rf".*{self.filter_pattern}.*"]
-            logger.info(loader_kwargs["filter_urls"])
-
-        loader = SitemapLoader(**loader_kwargs)
+        changed_docs = [doc for doc in docs if self.manifest.get(doc.metadata["source"]).get("content_hash") != doc.metadata["content_hash"]]
+        self._count("unchanged", len(docs) - len(changed_docs))
+        docs = changed_docs
 
-        sitemap_elements = loader.parse_sitemap(soup)
-        total_urls = len(sitemap_elements)
-        logger.info(f"Found {total_urls} URLs in sitemap.")
+        return docs, validators
 
-        total_blocks = (total_urls + self.block_size - 1) // self.block_size
-        logger.info(f"Total blocks: {total_blocks}.")
+    def store_block(self, cleaned):
+        """Chunk, embed and store changed pages, then record them in the crawl manifest."""
+        docs, validators = cleaned
 
-        for blocknum in range(total_blocks):
-            logger.info(f"Processing block {blocknum + 1} of {total_blocks}.")
+        stored = True
+        if docs:
+            stored = self.vector_store.store_documents(self.chunker.split_documents(docs))
+            self._count("embedded", len(docs) if stored else 0)
 
-            block_loader_kwargs = {
-                "web_path": self.sitemap_url,
-                "blocksize": self.block_size,
-                "blocknum": blocknum
-            }
-            if self.filter_urls:
-                block_loader_kwargs["filter_urls"] = [rf".*{self.filter_pattern}.*"]
-
-            loader = SitemapLoader(**block_loader_kwargs)
-            docs = loader.load()
-            logger.info(f"Loaded {len(docs)} documents from block {blocknum + 1}.")
-
-            for doc in docs: 
-                soup = BeautifulSoup(doc.page_content, "html.parser")
-
-                for tag in soup(["nav", "footer", "script", "style", "header"]):
-                    tag.decompose()
-                
-                clean_text = soup.get_text(separator=" ", strip=True)
-
-                clean_text = re.sub(r'\s+', ' ', clean_text)
-
-                doc.page_content = clean_text
-                
-                source_url = doc.metadata.get("source", "")
-                parts = source_url.replace(self.sitemap_url.replace('/sitemap.xml', "/"), "").split("/")
-                topic = parts[0] if len(parts) > 0 else ""
-                subtopic = parts[1] if len(parts) > 1 else ""
-                doc.metadata["topic"] = topic
-                doc.metadata["subtopic"] = subtopic
-
-            for doc in docs[:5]:
-                print(doc.metadata)
-            
-            self.vector_store.store_documents(docs)
+        failed_sources = set() if stored else {doc.metadata["source"] for doc in docs}
+        for source, fields in validators.items():
+            if source not in failed_sources:
+                self.manifest.update(source, **fields)
+        self.manifest.checkpoint()
 
+    def load_records(self, pipeline=None):
+        """Retrieve sitemaps in batches and store them, overlapping fetch, clean and store."""
+        logger.info(f"Processing sitemap with url {self.sitemap_url}.")
+        
+        self.fetcher = PageFetcher(max_workers=self.fetch_concurrency, per_host_limit=self.per_host_limit)
+        self.cleaner = HtmlCleaner(workers=self.clean_workers)
+        # A full re-crawl skips nothing and rebuilds the manifest from what it fetches.
+        self.manifest = CrawlManifest(self.manifest_path(), load=self.incremental)
+        self.stats = Counter()
+
+        resolver = SitemapResolver(
+            self.fetcher.session,
+            filter_pattern=self.filter_pattern if self.filter_urls else None,
+            timeout=self.fetcher.timeout
+        )
+        url_queue = resolver.resolve(self.sitemap_url)
+        logger.info(f"Fetching pages with concurrency {self.fetch_concurrency} (per host {self.per_host_limit}).")
+
+        pipeline = pipeline or IngestionPipeline(self.stages())
+        try:
+            pipeline.run(iter(lambda: url_queue.next_block(self.block_size), []))
+        finally:
+            self.fetcher.close()
+            self.cleaner.close()
+            self.manifest.save()
+
+        logger.info(f"Found {url_queue.drawn} URLs in sitemap.")
+        logger.info(f"Sitemap fetches made: {resolver.fetch_count}.")
+        if self.incremental:
+            logger.info(f"Incremental crawl: {self.stats['skipped']} skipped by lastmod, {self.stats['not_modified']} not modified, {self.stats['unchanged']} unchanged, {self.stats['embedded']} re-embedded.")
+        embedding_cache = getattr(self.vector_store.embedding_model, "cache", None)
+        if embedding_cache:
+            logger.info(f"Embedding cache: {embedding_cache.stats()}")
         logger.info("All blocks processed successfully")
 
 
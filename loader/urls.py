@@ -0,0 +1,145 @@
+from xml.etree import ElementTree
+from itertools import islice
+from utils.logger import get_logger
+import tempfile
+import gzip
+import re
+
+logger = get_logger(__name__)
+
+SITEMAP_FIELDS = ["loc", "lastmod", "changefreq", "priority"]
+GZIP_MAGIC = b"\x1f\x8b"
+SPOOL_CHUNK_SIZE = 1 << 16
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+class UrlQueue:
+    """Lazy queue of sitemap elements that ingestion blocks draw from."""
+
+    def __init__(self, elements):
+        self._elements = iter(elements)
+        self.drawn = 0
+
+    def next_block(self, block_size):
+        """Take up to block_size elements from the front of the queue."""
+        block = list(islice(self._elements, block_size))
+        self.drawn += len(block)
+        return block
+
+
+class SitemapResolver:
+    """Stream a sitemap (recursing into sitemap indexes) into a URL queue exactly once.
+
+    Each sitemap is spooled to a temporary file and parsed lazily from disk, so
+    memory stays flat and no socket is held open under pipeline backpressure.
+    """
+
+    def __init__(self, session, filter_pattern=None, timeout=30):
+        self.session = session
+        self.filter_regex = re.compile(rf".*{filter_pattern}.*") if filter_pattern else None
+        self.timeout = timeout
+        self.fetch_count = 0
+
+    def _spool(self, url):
+        """Download a sitemap to a temporary file, so no connection stays open while blocks wait on the pipeline."""
+        spool = tempfile.TemporaryFile()
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=SPOOL_CHUNK_SIZE):
+                    spool.write(chunk)
+        except Exception:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    def _iter_sitemap(self, url):
+        logger.info(f"Streaming sitemap {url}.")
+        self.fetch_count += 1
+
+        with self._spool(url) as spool:
+            stream = spool
+            if spool.peek(2)[:2] == GZIP_MAGIC:
+                stream = gzip.GzipFile(fileobj=spool)
+
+            root = None
+            for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+                if root is None:
+                    root = elem
+                if event != "end":
+                    continue
+
+                tag = _local_name(elem.tag)
+                if tag == "url":
+                    element = {}
+                    for child in elem:
+                        field = _local_name(child.tag)
+                        if field in SITEMAP_FIELDS and child.text:
+                            element[field] = child.text.strip()
+                    root.clear()
+
+                    if "loc" not in element:
+                        continue
+                    if self.filter_regex and not self.filter_regex.match(element["loc"]):
+                        continue
+                    yield element
+                elif tag == "sitemap":
+                    loc = next((child.text.strip() for child in elem if _local_name(child.tag) == "loc" and child.text), None)
+                    root.clear()
+                    if loc:
+                        yield from self._iter_sitemap(loc)
+
+    def resolve(self, sitemap_url):
+        """Return a UrlQueue that lazily streams the matching sitemap elements."""
+        return UrlQueue(self._iter_sitemap(sitemap_url))
+
+
+if __name__ == "__main__":
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    import threading
+    import tracemalloc
+    import requests
+
+    requests_seen = []
+    bodies = {}
+
+    class FakeSitemapHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            body = bodies[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSitemapHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    for count in [1000, 10000, 50000]:
+        children = "".join(f"<sitemap><loc>{base_url}/sitemap-{i}.xml.gz</loc></sitemap>" for i in range(4))
+        bodies["/sitemap.xml"] = f'<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{children}</sitemapindex>'.encode()
+        for i in range(4):
+            urls = "".join(f"<url><loc>{base_url}/content/{i}/page/{n}</loc><lastmod>2025-01-01</lastmod></url>" for n in range(count))
+            bodies[f"/sitemap-{i}.xml.gz"] = gzip.compress(f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'.encode())
+        requests_seen.clear()
+
+        tracemalloc.start()
+        resolver = SitemapResolver(requests.Session(), filter_pattern="content")
+        queue = resolver.resolve(f"{base_url}/sitemap.xml")
+        while queue.next_block(100):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert resolver.fetch_count == len(requests_seen) == 5, requests_seen
+        print(f"urls={queue.drawn:>7}  sitemap fetches={resolver.fetch_count}  peak memory={peak / 1e6:6.2f} MB")
+
+    server.shutdown()
@@ -75,17 +75,11 @@ if user_input := st.chat_input("Ask your question or start chatting..."):
     st.session_state.messages.append({"role": "user", "content": user_input})
     st.chat_message("user").write(user_input)
 
-    embedding_model = initialize_embedding_model(config['embedding_model']).model
-    vector_store = initialize_vector_store(
-        config['vector_store'], 
-        config['collection_name'], 
-        config['persist_dir'], 
-        embedding_model
-    )
-    chat_model = initialize_chat_model(model_choice.lower(), temperature=temperature, max_tokens=max_tokens)
+    vector_store = get_vector_store(config)
+    chat_model = get_chat_model(model_choice.lower(), temperature=temperature, max_tokens=max_tokens)
 
     with st.spinner("Thinking..."):
-        response = semantic_search(
+        response = semantic_search_stream(
             vector_store=vector_store, 
             chat_model=chat_model,
             query=user_input,
@@ -93,5 +87,14 @@ if user_input := st.chat_input("Ask your question or start chatting..."):
             session_id=st.session_state["session_id"],
             mode="chat"
         )
-    st.session_state.messages.append({"role": "assistant", "content": response["response_text"]})
-    st.chat_message("assistant").write(response["response_text"])
\ No newline at end of file
+    with st.chat_message("assistant"):
+        if isinstance(response, dict):
+            response_text = st.write_stream(response["response_stream"])
+            metrics = response["metrics"]
+            st.caption(f"First token in {metrics['retrieval_seconds'] + metrics.get('first_token_seconds', 0.0):.2f}s, "
+                       f"complete in {metrics['retrieval_seconds'] + metrics.get('total_seconds', 0.0):.2f}s, "
+                       f"prompt ~{metrics.get('prompt_tokens', 0)} tokens")
+        else:
+            response_text = response or "I'm sorry, but I couldn't generate a response for this query."
+            st.write(response_text)
+    st.session_state.messages.append({"role": "assistant", "content": response_text})
\ No newline at end of file
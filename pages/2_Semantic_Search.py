@@ -77,6 +77,17 @@ with col2:
 
     top_k_results = st.selectbox("Number of Results to Retrieve:", [5, 10, 15, 20], index=1)
 
+    retrieval_mode = st.radio(
+        "Retrieval Mode:",
+        ["Vector", "Hybrid"],
+        index=1 if Config.DEFAULT_RETRIEVAL == "hybrid" else 0,
+        horizontal=True
+    )
+    st.caption("**Hybrid** also runs a keyword (BM25) search and fuses both rankings, which helps with exact names and numbers.")
+
+    diversify = st.checkbox("Diversify results (MMR)", value=Config.MMR_ENABLED)
+    st.caption("Skips near-duplicate pages so the answer draws on more distinct sources.")
+
     st.markdown("\n")
 
 
@@ -124,31 +135,37 @@ with center_col[1]:
 
 if search_clicked:
     with st.spinner(f"Performing semantic search for: **{query_text}**"):
-        embedding_model = initialize_embedding_model(config['embedding_model']).model
-        vector_store = initialize_vector_store(
-            config['vector_store'], 
-            config['collection_name'], 
-            config['persist_dir'], 
-            embedding_model
-        )
-        chat_model = initialize_chat_model(model_choice.lower(), temperature=creativity, max_tokens=max_tokens)
-        response = semantic_search(
+        vector_store = get_vector_store(config)
+        chat_model = get_chat_model(model_choice.lower(), temperature=creativity, max_tokens=max_tokens)
+        response = semantic_search_stream(
             vector_store,
             chat_model,
             query=query_text,
             filter=None,
             session_id=None,
-            mode="search"
+            mode="search",
+            retrieval=retrieval_mode.lower(),
+            diversify=diversify
         )
 
 
-        st.markdown("##### Semantic Search Results")
+    st.markdown("##### Semantic Search Results")
 
-        st.caption("Below are the most relevant results retrieved based on your query. "
-           "Each result includes a title (clickable link) and a brief content preview for context.")
-        
+    st.caption("Below are the most relevant results retrieved based on your query. "
+       "Each result includes a title (clickable link) and a brief content preview for context.")
+
+    if not isinstance(response, dict):
+        st.info(response or "I'm sorry, but I couldn't generate a response for this query.")
+    else:
         st.markdown("**Content:**")
-        st.markdown(response["response_text"])
+        st.write_stream(response["response_stream"])
+        if response.get("cached"):
+            st.caption("Answered from the response cache for a similar earlier question.")
+        else:
+            metrics = response["metrics"]
+            st.caption(f"First token in {metrics['retrieval_seconds'] + metrics.get('first_token_seconds', 0.0):.2f}s, "
+                       f"complete in {metrics['retrieval_seconds'] + metrics.get('total_seconds', 0.0):.2f}s, "
+                       f"prompt ~{metrics.get('prompt_tokens', 0)} tokens")
 
         if response["references"]:
             st.markdown("**References:**")
@@ -157,5 +174,4 @@ if search_clicked:
         else:
             st.info("No references found.")
 
-        st.caption("Click on the titles to view the full content. The short description provides context from the matched document.")
-
+    st.caption("Click on the titles to view the full content. The short description provides context from the matched document.")
@@ -82,13 +82,7 @@ with center_col[1]:
 
 if search_clicked:
     with st.spinner(f"Performing keyword search for: **{keyword_input}**"):
-        embedding_model = initialize_embedding_model(config['embedding_model']).model
-        vector_store = initialize_vector_store(
-            config['vector_store'], 
-            config['collection_name'], 
-            config['persist_dir'], 
-            embedding_model
-        )
+        vector_store = get_vector_store(config)
         response = keyword_search(
             vector_store,
             text=keyword_input,
@@ -97,7 +91,10 @@ if search_clicked:
         )
 
         st.markdown("##### Search Results")
+        if isinstance(response, str):
+            st.info(response)
+            response = []
         for idx, item in enumerate(response, 1):
-            st.markdown(f"**{idx}. [{item['title']}]({item['url']})**")
+            st.markdown(f"**{idx}. [{item['title']}]({item['url']})** (BM25: {item['score']:.2f})")
             st.write(item['short_content'])
             st.write("---")
@@ -72,25 +72,38 @@ if submitted:
 
 
 if os.path.exists(CONFIG_FILE):
+    full_recrawl = st.checkbox("Full re-crawl (ignore the crawl manifest and re-embed every page)", value=False)
+    st.caption("By default only pages whose sitemap lastmod, HTTP validators or cleaned text changed since the last run are re-embedded.")
+
     if st.button("Start Processing"):
         with st.spinner("Processing... Please wait while we load your data."):
             with open(CONFIG_FILE, 'r') as f:
                 config = json.load(f)
 
-            embedding_model = initialize_embedding_model(config['embedding_model']).model
-            vector_store = initialize_vector_store(
-                config['vector_store'], 
-                config['collection_name'], 
-                config['persist_dir'], 
-                embedding_model
-            )
+            vector_store = get_vector_store(config)
             load_data(
                 config['sitemap_url'],
                 vector_store, 
                 Config.BATCH_SIZE, 
                 config['filter_enabled'],
                 config['filter_pattern'],
+                incremental=not full_recrawl,
             )
 
         st.success("Data processing completed successfully!")
 
+
+    st.markdown("##### Collection Health")
+    with open(CONFIG_FILE, 'r') as f:
+        config = json.load(f)
+    stats = get_vector_store(config).collection_stats()
+    if stats:
+        health_cols = st.columns(3)
+        health_cols[0].metric("Documents", stats["documents"])
+        health_cols[1].metric("Text Size (MB)", f"{stats['text_bytes'] / 1_000_000:.2f}")
+        health_cols[2].metric("Last Ingest", time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["last_ingest"])) if stats["last_ingest"] else "Never")
+        if stats["topic"]:
+            st.caption("Documents per topic")
+            st.bar_chart(stats["topic"])
+    else:
+        st.info("No statistics recorded for this collection yet.")
@@ -69,3 +69,16 @@ class Templates:
         {query}
 
     """
+
+    SUMMARY_PROMPT = """
+        You are an AI assistant that keeps a running summary of a conversation so it can continue without the full transcript.
+        Fold the new messages into the existing summary. Keep names, facts, decisions and open questions; drop greetings and repetition.
+
+        Existing Summary:
+        {summary}
+
+        New Messages:
+        {messages}
+
+        Return only the updated summary, in a few sentences.
+    """
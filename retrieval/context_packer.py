@@ -0,0 +1,132 @@
+from vectorstore.keyword_index import tokenize
+from utils.tokens import count_tokens, truncate_tokens
+from prompts.prompts import Templates
+from config.config import Config
+from utils.logger import get_logger
+import time
+import math
+import re
+
+logger = get_logger(__name__)
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Context windows by model family; Ollama serves llama models with a 4096-token num_ctx unless configured otherwise.
+MODEL_CONTEXT_WINDOWS = {"gemini": 1048576, "llama": 4096}
+
+PROMPT_TEMPLATE_TOKENS = count_tokens(Templates.QA_PROMPT)
+
+def context_budget(chat_model, mode="search"):
+    """Tokens available for retrieved context: the model's window minus its output and prompt overhead, capped by CONTEXT_MAX_TOKENS."""
+    model = getattr(chat_model, "model", None)
+    max_tokens = chat_model.max_tokens or Config.DEFAULT_MAX_TOKENS
+    window = getattr(model, "num_ctx", None) or next(
+        (size for family, size in MODEL_CONTEXT_WINDOWS.items() if family in (chat_model.model_name or "").lower()),
+        Config.CONTEXT_WINDOW_TOKENS
+    )
+    reserved = max_tokens + PROMPT_TEMPLATE_TOKENS + (Config.HISTORY_MAX_TOKENS if mode == "chat" else 0)
+    return max(Config.CONTEXT_MIN_TOKENS, min(Config.CONTEXT_MAX_TOKENS, window - reserved))
+
+def _shingles(text):
+    terms = tokenize(text)
+    return set(zip(terms, terms[1:])) or set(terms)
+
+def _similarity(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+def _ranked_sentences(text, query_terms, max_sentences):
+    """The passage's max_sentences sentences that share the most terms with the query, most relevant first, with their positions."""
+    sentences = [sentence.strip() for sentence in SENTENCE_PATTERN.split(text) if sentence.strip()]
+    scores = []
+    for sentence in sentences:
+        terms = tokenize(sentence)
+        overlap = sum(1 for term in terms if term in query_terms)
+        scores.append(overlap / math.sqrt(len(terms) or 1))
+    ranked = sorted(range(len(sentences)), key=lambda position: (-scores[position], position))
+    return [(position, sentences[position]) for position in ranked[:max_sentences]]
+
+def pack_context(query, documents, budget, dedup_similarity=Config.CONTEXT_DEDUP_SIMILARITY, max_sentences=Config.CONTEXT_MAX_SENTENCES):
+    """Assemble context from scored documents within a token budget.
+
+    Documents are taken best score (lowest distance) first; a passage whose word
+    bigrams overlap an already packed one by dedup_similarity or more is dropped.
+    Each passage contributes its max_sentences most query-relevant sentences, taken
+    in relevance order while they fit and joined in document order; when none fits,
+    its best sentence is truncated to the remaining budget.
+    Returns (context, stats), with context None when nothing fits.
+    """
+    start = time.perf_counter()
+    query_terms = set(tokenize(query))
+    ordered = sorted(documents, key=lambda doc: doc.metadata.get("score", 0.0))
+
+    passages, packed_shingles = [], []
+    duplicates = 0
+    used_tokens = 0
+    for doc in ordered:
+        if used_tokens >= budget:
+            break
+        shingles = _shingles(doc.page_content)
+        if any(_similarity(shingles, seen) >= dedup_similarity for seen in packed_shingles):
+            duplicates += 1
+            continue
+
+        ranked = _ranked_sentences(doc.page_content, query_terms, max_sentences)
+        chosen = []
+        for position, sentence in ranked:
+            tokens = count_tokens(sentence)
+            if used_tokens + tokens > budget:
+                continue
+            chosen.append((position, sentence))
+            used_tokens += tokens
+        if not chosen and ranked:
+            position, sentence = ranked[0]
+            sentence = truncate_tokens(sentence, budget - used_tokens)
+            chosen.append((position, sentence))
+            used_tokens += count_tokens(sentence)
+        if not chosen:
+            continue
+        passages.append(" ".join(sentence for _, sentence in sorted(chosen)))
+        packed_shingles.append(shingles)
+
+    context = "\n\n".join(passages) or None
+    stats = {
+        "passages_retrieved": len(documents),
+        "passages_packed": len(passages),
+        "duplicates_dropped": duplicates,
+        "context_tokens": used_tokens,
+        "context_budget": budget,
+        "packing_seconds": time.perf_counter() - start,
+    }
+    logger.info(f"Packed {len(passages)}/{len(documents)} passages into {used_tokens}/{budget} tokens "
+                f"({duplicates} duplicates dropped) in {stats['packing_seconds'] * 1000:.2f} ms.")
+    return context, stats
+
+def prompt_tokens(query, context):
+    """Estimated prompt size for the QA template with this context and question (chat history excluded)."""
+    return PROMPT_TEMPLATE_TOKENS + count_tokens(context) + count_tokens(query)
+
+
+if __name__ == "__main__":
+    from langchain_core.documents import Document
+    import random
+
+    random.seed(0)
+    words = ["award", "nomination", "small", "business", "acquisition", "eligible", "agency", "program", "deadline", "criteria"]
+    def passage(i):
+        vocabulary = words + [f"term{i}x{j}" for j in range(30)]
+        return " ".join(
+            " ".join(random.choices(vocabulary, k=12)).capitalize() + "." for _ in range(8)
+        )
+
+    query = "Who is eligible to be nominated for the small business award?"
+    base = [passage(i) for i in range(20)]
+    documents = [Document(page_content=text, metadata={"score": 0.2 + i * 0.02}) for i, text in enumerate(base)]
+    documents += [Document(page_content=text, metadata={"score": 0.25 + i * 0.02}) for i, text in enumerate(base[:5])]
+
+    unpacked = "\n\n".join(doc.page_content for doc in documents)
+    for budget in [250, 500, 1000]:
+        context, stats = pack_context(query, documents, budget)
+        print(f"budget {budget:>4}: prompt {prompt_tokens(query, context)} tokens vs {prompt_tokens(query, unpacked)} unpacked, "
+              f"{stats['passages_packed']} passages, {stats['duplicates_dropped']} duplicates, {stats['packing_seconds'] * 1000:.2f} ms")
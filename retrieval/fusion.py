@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.documents import Document
+from config.config import Config
+from utils.logger import get_logger
+import time
+
+logger = get_logger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=Config.RETRIEVAL_WORKERS, thread_name_prefix="retrieval")
+
+def topics_from_filter(filter):
+    """Map a Chroma metadata filter on 'topic' to a topic list for the keyword index, or None if it can't be."""
+    if not filter:
+        return []
+    if set(filter) != {"topic"}:
+        return None
+    condition = filter["topic"]
+    if isinstance(condition, str):
+        return [condition]
+    if isinstance(condition, dict) and set(condition) == {"$eq"}:
+        return [condition["$eq"]]
+    if isinstance(condition, dict) and set(condition) == {"$in"}:
+        return list(condition["$in"])
+    return None
+
+def reciprocal_rank_fusion(ranked_lists, k=Config.RRF_K, top_k=None):
+    """Fuse ranked Document lists by summing 1 / (k + rank) per document id."""
+    fused, scores, sources = {}, {}, {}
+    for name, documents in ranked_lists.items():
+        for rank, doc in enumerate(documents, start=1):
+            scores[doc.id] = scores.get(doc.id, 0.0) + 1.0 / (k + rank)
+            sources.setdefault(doc.id, []).append(name)
+            # Prefer the vector hit's metadata, since it carries the distance score.
+            if doc.id not in fused or name == "vector":
+                fused[doc.id] = doc
+
+    ranked_ids = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [
+        Document(
+            id=doc_id,
+            metadata={**fused[doc_id].metadata, "rrf_score": scores[doc_id], "retrievers": sources[doc_id]},
+            page_content=fused[doc_id].page_content
+        )
+        for doc_id in ranked_ids
+    ]
+
+def hybrid_search(vector_store, query, top_k=Config.TOP_K_RESULTS, filter=None, fetch_k=Config.HYBRID_FETCH_K, diversify=False):
+    """Run vector and BM25 retrieval concurrently and fuse them with reciprocal rank fusion.
+
+    Lexical-only hits are given the same distance score as vector hits, so the
+    SCORE_THRESHOLD context selection applies to the fused list unchanged.
+    With diversify, the fused list is cut to fetch_k and re-selected by MMR.
+    """
+    topics = topics_from_filter(filter)
+    fetch_k = max(fetch_k, top_k)
+    start = time.perf_counter()
+
+    vector_future = executor.submit(vector_store.query_similar, query_text=query, top_k=fetch_k, filter=filter)
+    lexical_future = executor.submit(vector_store.keyword_search, query, topics=topics or None, top_k=fetch_k) if topics is not None else None
+
+    ranked_lists = {"vector": vector_future.result()}
+    if lexical_future:
+        ranked_lists["lexical"] = lexical_future.result()
+    else:
+        logger.warning(f"Filter {filter} cannot be applied to the keyword index, using vector retrieval only.")
+    retrieved = time.perf_counter() - start
+
+    for doc in ranked_lists.get("lexical", []):
+        doc.metadata["bm25_score"] = doc.metadata.pop("score", None)
+    fused = reciprocal_rank_fusion(ranked_lists, top_k=fetch_k if diversify else top_k)
+    if diversify:
+        fused = vector_store.diversify(query, fused, top_k=top_k)
+    results = vector_store.score_documents(query, fused)
+
+    logger.info(
+        f"Hybrid retrieval: {len(ranked_lists['vector'])} vector + {len(ranked_lists.get('lexical', []))} lexical hits "
+        f"fused into {len(results)} in {(time.perf_counter() - start) * 1000:.1f} ms (retrieval {retrieved * 1000:.1f} ms)."
+    )
+    return results
@@ -0,0 +1,78 @@
+from utils.logger import get_logger
+import numpy as np
+
+logger = get_logger(__name__)
+
+def maximal_marginal_relevance(query_embedding, embeddings, k, lambda_mult):
+    """Indices of k candidate embeddings chosen by maximal marginal relevance.
+
+    Relevance and the candidate-candidate similarity matrix are computed once as
+    matrix products; each selection step is a vectorised update of the running
+    maximum similarity to the already selected set.
+    """
+    candidates = np.asarray(embeddings, dtype=np.float32)
+    if candidates.ndim != 2 or not len(candidates) or k <= 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+
+    k = min(k, len(candidates))
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        chosen = int(np.argmax(scores))
+        selected.append(chosen)
+        available[chosen] = False
+        np.maximum(max_similarity, similarity[chosen], out=max_similarity)
+
+    return selected
+
+
+if __name__ == "__main__":
+    import time
+
+    def mmr_loops(query_embedding, embeddings, k, lambda_mult):
+        """Reference implementation with per-pair Python loops."""
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(a, b)) / ((sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5))
+        relevance = [cosine(query_embedding, e) for e in embeddings]
+        selected = [max(range(len(embeddings)), key=relevance.__getitem__)]
+        while len(selected) < k:
+            best, best_score = None, -float("inf")
+            for i, e in enumerate(embeddings):
+                if i in selected:
+                    continue
+                score = lambda_mult * relevance[i] - (1 - lambda_mult) * max(cosine(e, embeddings[j]) for j in selected)
+                if score > best_score:
+                    best, best_score = i, score
+            selected.append(best)
+        return selected
+
+    rng = np.random.default_rng(0)
+    dimensions = 768
+    for fetch_k, k in [(20, 5), (50, 10), (100, 10), (200, 20)]:
+        query = rng.normal(size=dimensions).tolist()
+        embeddings = rng.normal(size=(fetch_k, dimensions)).tolist()
+
+        runs = 50
+        start = time.perf_counter()
+        for _ in range(runs):
+            vectorised = maximal_marginal_relevance(query, embeddings, k, 0.5)
+        numpy_ms = (time.perf_counter() - start) / runs * 1000
+
+        start = time.perf_counter()
+        looped = mmr_loops(query, embeddings, k, 0.5)
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        assert vectorised == looped
+        print(f"fetch_k={fetch_k:>3}  k={k:>2}  numpy {numpy_ms:7.2f} ms   python loops {loop_ms:8.1f} ms")
@@ -0,0 +1,190 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from embedding.micro_batch import MicroBatchEmbeddings
+from main import semantic_search, keyword_search, initialize_embedding_model, initialize_vector_store, get_chat_model
+from config.config import Config
+from utils.logger import get_logger
+import json
+
+logger = get_logger(__name__)
+
+CONFIG_FILE = "rag_config.json"
+
+class QueryService:
+    """Backends behind the HTTP API: a vector store and a factory for chat models."""
+
+    def __init__(self, vector_store, chat_model_factory=get_chat_model):
+        self.vector_store = vector_store
+        self.chat_model_factory = chat_model_factory
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the service from rag_config.json settings, with micro-batched query embeddings."""
+        generator = initialize_embedding_model(config['embedding_model'])
+        embedding_model = MicroBatchEmbeddings(generator.model, query_embeddings=generator.base_model)
+        vector_store = initialize_vector_store(config['vector_store'], config['collection_name'], config['persist_dir'], embedding_model)
+        return cls(vector_store)
+
+    def chat_model(self, body):
+        return self.chat_model_factory(
+            body.get("chat_model", Config.DEFAULT_CHAT_MODEL),
+            float(body.get("temperature", Config.DEFAULT_TEMPERATURE)),
+            int(body.get("max_tokens", Config.DEFAULT_MAX_TOKENS))
+        )
+
+    def search(self, body):
+        return semantic_search(
+            self.vector_store,
+            self.chat_model(body),
+            query=body["query"],
+            filter=body.get("filter"),
+            session_id=None,
+            mode="search",
+            retrieval=body.get("retrieval", Config.DEFAULT_RETRIEVAL),
+            diversify=bool(body.get("diversify", Config.MMR_ENABLED))
+        )
+
+    def chat(self, body):
+        return semantic_search(
+            self.vector_store,
+            self.chat_model(body),
+            query=body["query"],
+            filter=body.get("filter"),
+            session_id=body["session_id"],
+            mode="chat",
+            retrieval=body.get("retrieval", Config.DEFAULT_RETRIEVAL),
+            diversify=bool(body.get("diversify", Config.MMR_ENABLED))
+        )
+
+    def keyword(self, body):
+        results = keyword_search(self.vector_store, body["text"], body.get("filter"), int(body.get("top_k", Config.TOP_K_RESULTS)))
+        return {"results": results if isinstance(results, list) else [], "message": None if isinstance(results, list) else results}
+
+    def health(self):
+        embedding_model = self.vector_store.embedding_model
+        return {
+            "collection": self.vector_store.collection_stats(),
+            "query_batching": embedding_model.stats() if isinstance(embedding_model, MicroBatchEmbeddings) else None,
+        }
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """HTTP server that handles requests on a bounded worker pool instead of a thread per request."""
+
+    request_queue_size = 128
+
+    def __init__(self, address, service, workers=Config.SERVICE_WORKERS):
+        super().__init__(address, QueryHandler)
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /search, /chat and /keyword, GET /health."""
+
+    routes = {"/search": "search", "/chat": "chat", "/keyword": "keyword"}
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self.send_json(404, {"error": f"Unknown path {self.path}"})
+        self.send_json(200, self.server.service.health())
+
+    def do_POST(self):
+        route = self.routes.get(self.path)
+        if route is None:
+            return self.send_json(404, {"error": f"Unknown path {self.path}"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            result = getattr(self.server.service, route)(body)
+        except (KeyError, ValueError) as e:
+            return self.send_json(400, {"error": f"Invalid request: {e}"})
+        except Exception as e:
+            logger.error(f"Error handling {self.path}: {e}")
+            return self.send_json(500, {"error": str(e)})
+        if not result:
+            # semantic_search logs and swallows its errors, returning an empty string.
+            return self.send_json(500, {"error": f"Could not handle {self.path}; see the service log."})
+        self.send_json(200, result if isinstance(result, dict) else {"response_text": result, "references": []})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve(service, host=Config.SERVICE_HOST, port=Config.SERVICE_PORT, workers=Config.SERVICE_WORKERS):
+    server = PooledHTTPServer((host, port), service, workers)
+    logger.info(f"Query service listening on http://{host}:{server.server_port} with {workers} workers.")
+    return server
+
+
+if __name__ == "__main__":
+    from service.stubs import StubEmbeddings, StubChat
+    from langchain_core.documents import Document
+    from chat.response_cache import response_cache
+    from urllib.request import urlopen, Request
+    import statistics
+    import tempfile
+    import threading
+    import time
+    import sys
+
+    if "--stub" not in sys.argv:
+        with open(CONFIG_FILE, "r") as f:
+            serve(QueryService.from_config(json.load(f))).serve_forever()
+
+    # Load test against stub embedding and LLM backends: python -m service.server --stub
+    CLIENTS = 64
+    REQUESTS = 512
+
+    stub_embeddings = StubEmbeddings(latency=0.02)
+    chat_model = StubChat(latency=0.2)
+    with tempfile.TemporaryDirectory() as directory:
+        vector_store = initialize_vector_store("chroma", "service_load_test", directory, MicroBatchEmbeddings(stub_embeddings))
+        vector_store.store_documents([
+            Document(page_content=f"Page {i} about acquisition awards and small business programs.", metadata={"source": f"https://example.com/{i}"})
+            for i in range(200)
+        ])
+        response_cache.max_entries = 0  # every request should reach retrieval and the LLM
+        stub_embeddings.calls = 0
+
+        server = serve(QueryService(vector_store, lambda *args: chat_model), port=0, workers=CLIENTS)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/search"
+
+        latencies = []
+        def client(offset):
+            for i in range(offset, REQUESTS, CLIENTS):
+                start = time.perf_counter()
+                payload = json.dumps({"query": f"Who can apply for award number {i}?", "retrieval": "vector"}).encode("utf-8")
+                with urlopen(Request(url, data=payload, headers={"Content-Type": "application/json"})) as response:
+                    json.load(response)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        clients = [threading.Thread(target=client, args=(offset,)) for offset in range(CLIENTS)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        print(f"{REQUESTS} requests from {CLIENTS} clients in {elapsed:.2f}s ({REQUESTS / elapsed:.1f} req/s), "
+              f"p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms")
+        print(f"Query embedding: {vector_store.embedding_model.stats()}, embedding backend calls: {stub_embeddings.calls}")
+        server.shutdown()
+        server.server_close()
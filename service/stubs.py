@@ -0,0 +1,48 @@
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+from langchain_core.messages import AIMessage
+from chat.base import BaseChat
+import threading
+import hashlib
+import asyncio
+import time
+
+class StubEmbeddings(Embeddings):
+    """Deterministic embedding backend with a fixed per-call latency, for load tests without Ollama/Gemini."""
+
+    def __init__(self, latency=0.02, dimensions=32):
+        self.model = "stub-embed"
+        self.latency = latency
+        self.dimensions = dimensions
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, text):
+        digest = hashlib.sha256(text.lower().encode("utf-8")).digest()
+        return [byte / 255 for byte in digest[:self.dimensions]]
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class StubChat(BaseChat):
+    """Chat model stand-in that answers after a fixed latency, for load tests without an LLM."""
+
+    def __init__(self, latency=0.5):
+        super().__init__(model_name="stub-llm")
+
+        def answer(prompt):
+            time.sleep(latency)
+            return AIMessage(content="Stub answer.")
+
+        async def aanswer(prompt):
+            await asyncio.sleep(latency)
+            return AIMessage(content="Stub answer.")
+
+        self.model = RunnableLambda(answer, afunc=aanswer)
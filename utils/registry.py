@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from utils.logger import get_logger
+import threading
+import time
+import json
+
+logger = get_logger(__name__)
+
+def config_key(*parts):
+    """Stable key for a config dict and any extra parameters."""
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class ResourceRegistry:
+    """Process-wide cache of expensive clients, built once per key and shared across reruns and sessions.
+
+    Kinds are bounded to max_per_kind least recently used entries; resources that
+    own a file or database (one per path) are registered with evict=False and kept
+    for the life of the process.
+    """
+
+    def __init__(self, max_per_kind=4):
+        self.max_per_kind = max_per_kind
+        self._resources = {}
+        self._build_seconds = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, kind, key, factory, evict=True):
+        """Return the resource of this kind for key, building it with factory() on first use."""
+        start = time.perf_counter()
+        with self._lock:
+            resources = self._resources.setdefault(kind, OrderedDict())
+            key_lock = self._key_locks.setdefault((kind, key), threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in resources:
+                    resources.move_to_end(key)
+                    resource = resources[key]
+                    lookup = time.perf_counter() - start
+                    logger.debug(f"Reusing {kind} in {lookup * 1000:.2f} ms (saved {self._build_seconds[(kind, key)]:.3f}s build).")
+                    return resource
+
+            resource = factory()
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                resources[key] = resource
+                self._build_seconds[(kind, key)] = elapsed
+                while evict and len(resources) > self.max_per_kind:
+                    stale_key, _ = resources.popitem(last=False)
+                    self._build_seconds.pop((kind, stale_key), None)
+                    self._key_locks.pop((kind, stale_key), None)
+            logger.info(f"Built {kind} in {elapsed:.3f}s.")
+            return resource
+
+    def values(self, kind):
+        """The resources currently cached for a kind."""
+        with self._lock:
+            return list(self._resources.get(kind, {}).values())
+
+    def clear(self, kind=None):
+        """Drop cached resources so they are rebuilt on next use."""
+        with self._lock:
+            for cached_kind in [kind] if kind else list(self._resources):
+                for key in self._resources.pop(cached_kind, {}):
+                    self._build_seconds.pop((cached_kind, key), None)
+
+
+registry = ResourceRegistry()
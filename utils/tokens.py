@@ -0,0 +1,18 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def count_tokens(text):
+    """Approximate the model token count of text by counting words and punctuation marks."""
+    if not text:
+        return 0
+    return len(TOKEN_PATTERN.findall(text))
+
+def truncate_tokens(text, max_tokens):
+    """The prefix of text holding at most max_tokens tokens, as counted by count_tokens."""
+    if max_tokens <= 0 or not text:
+        return ""
+    for count, match in enumerate(TOKEN_PATTERN.finditer(text), start=1):
+        if count == max_tokens:
+            return text[:match.end()]
+    return text
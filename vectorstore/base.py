@@ -1,4 +1,8 @@
 from abc import abstractmethod
+import asyncio
+from vectorstore.catalog import open_catalog
+import hashlib
+import os
 
 class BaseVectorStore:
     """Abstract base class for vector store management."""
@@ -8,17 +12,51 @@ class BaseVectorStore:
         self.persist_directory = persist_directory
         self.embedding_model = embedding_model
         self.vectorstore = None
+        self.catalog = open_catalog(os.path.join(persist_directory, "collection_catalog.sqlite3"))
 
     @abstractmethod
     def store_documents(self, documents):
         """Store documents in the vector store."""
         pass
 
+    @staticmethod
+    def content_hash(text):
+        """Hash document text so unchanged documents are never re-embedded."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def document_id(document):
+        """Stable document ID derived from the source URL and chunk position."""
+        source = document.metadata.get("source") or document.page_content
+        chunk_index = document.metadata.get("chunk_index", 0)
+        return f"{hashlib.sha1(source.encode('utf-8')).hexdigest()}-{chunk_index}"
+
+    def generation(self, collection_name=None):
+        """Counter bumped whenever a collection's contents change, used to invalidate derived caches."""
+        return self.catalog.generation(collection_name or self.collection_name)
+
+    def bump_generation(self, collection_name=None):
+        """Advance the collection's generation counter in the stats catalog."""
+        return self.catalog.bump_generation(collection_name or self.collection_name)
+
+    def collection_stats(self, collection_name=None):
+        """Document count, text bytes, last-ingest time and topic/subtopic histograms from the catalog."""
+        return self.catalog.stats(collection_name or self.collection_name)
+
+    @abstractmethod
+    def stored_sources(self, sources):
+        """The subset of source URLs that have at least one chunk in the collection."""
+        pass
+
     @abstractmethod
     def query_similar(self, query_text, top_k=5):
         """Retrieve similar documents from the vector store."""
         pass
 
+    async def aquery_similar(self, query_text, top_k=5, filter=None):
+        """Async query_similar; runs the synchronous search in a worker thread unless a store overrides it."""
+        return await asyncio.to_thread(self.query_similar, query_text=query_text, top_k=top_k, filter=filter)
+
     @abstractmethod
     def delete_collection(self):
         """Delete the vector store collection."""
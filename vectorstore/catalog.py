@@ -0,0 +1,122 @@
+from utils.logger import get_logger
+from utils.registry import registry
+from collections import Counter
+import threading
+import sqlite3
+import time
+import os
+
+logger = get_logger(__name__)
+
+HISTOGRAM_FIELDS = ("topic", "subtopic")
+
+
+
+class CollectionCatalog:
+    """SQLite catalog of per-collection statistics, maintained incrementally on every write.
+
+    Holds document counts, total text bytes, last-ingest time, topic/subtopic
+    histograms and the generation counter used to invalidate derived caches.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS collections ("
+            "name TEXT PRIMARY KEY, documents INTEGER NOT NULL DEFAULT 0, text_bytes INTEGER NOT NULL DEFAULT 0, "
+            "last_ingest REAL, generation INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS histograms ("
+            "collection TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (collection, field, value))"
+        )
+        self.connection.commit()
+
+    def _ensure(self, name):
+        self.connection.execute("INSERT OR IGNORE INTO collections (name) VALUES (?)", (name,))
+
+    def has(self, name):
+        with self._lock:
+            return self.connection.execute("SELECT 1 FROM collections WHERE name = ?", (name,)).fetchone() is not None
+
+    def apply(self, name, added=(), removed=(), ingest=True):
+        """Fold added and removed (metadata, text) pairs into the collection's counters."""
+        added, removed = list(added), list(removed)
+        histogram = Counter()
+        for sign, pairs in ((1, added), (-1, removed)):
+            for metadata, _ in pairs:
+                for field in HISTOGRAM_FIELDS:
+                    value = (metadata or {}).get(field)
+                    if value is not None:
+                        histogram[(field, str(value))] += sign
+        text_bytes = sum(len((text or "").encode("utf-8")) for _, text in added) - sum(len((text or "").encode("utf-8")) for _, text in removed)
+
+        with self._lock:
+            self._ensure(name)
+            self.connection.execute(
+                "UPDATE collections SET documents = MAX(0, documents + ?), text_bytes = MAX(0, text_bytes + ?), "
+                "last_ingest = COALESCE(?, last_ingest) WHERE name = ?",
+                (len(added) - len(removed), text_bytes, time.time() if ingest else None, name)
+            )
+            for (field, value), delta in histogram.items():
+                if delta:
+                    self.connection.execute(
+                        "INSERT INTO histograms (collection, field, value, count) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (collection, field, value) DO UPDATE SET count = count + excluded.count",
+                        (name, field, value, delta)
+                    )
+            self.connection.execute("DELETE FROM histograms WHERE collection = ? AND count <= 0", (name,))
+            self.connection.commit()
+
+    def reset(self, name):
+        """Zero a collection's statistics after it was emptied or deleted; the generation is kept."""
+        with self._lock:
+            self._ensure(name)
+            self.connection.execute("DELETE FROM histograms WHERE collection = ?", (name,))
+            self.connection.execute("UPDATE collections SET documents = 0, text_bytes = 0 WHERE name = ?", (name,))
+            self.connection.commit()
+
+    def generation(self, name):
+        with self._lock:
+            row = self.connection.execute("SELECT generation FROM collections WHERE name = ?", (name,)).fetchone()
+            return row[0] if row else 0
+
+    def bump_generation(self, name):
+        with self._lock:
+            self._ensure(name)
+            self.connection.execute("UPDATE collections SET generation = generation + 1 WHERE name = ?", (name,))
+            self.connection.commit()
+            return self.connection.execute("SELECT generation FROM collections WHERE name = ?", (name,)).fetchone()[0]
+
+    def stats(self, name):
+        """Return the catalog entry for a collection, or None if it has never been recorded."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT documents, text_bytes, last_ingest, generation FROM collections WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                return None
+            histograms = {field: {} for field in HISTOGRAM_FIELDS}
+            for field, value, count in self.connection.execute(
+                "SELECT field, value, count FROM histograms WHERE collection = ? ORDER BY count DESC", (name,)
+            ):
+                histograms.setdefault(field, {})[value] = count
+        return {
+            "name": name,
+            "documents": row[0],
+            "text_bytes": row[1],
+            "last_ingest": row[2],
+            "generation": row[3],
+            **histograms,
+        }
+
+
+def open_catalog(path):
+    """Return the process-wide CollectionCatalog for a path, creating it on first use."""
+    return registry.get("catalog", path, lambda: CollectionCatalog(path), evict=False)
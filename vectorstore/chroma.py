@@ -2,30 +2,127 @@ from vectorstore.base import BaseVectorStore
 from langchain_core.documents import Document
 from langchain_chroma import Chroma
 from config.config import Config
+from embedding.query_cache import query_cache, embedding_model_name
+from vectorstore.keyword_index import open_keyword_index
+from loader.manifest import CrawlManifest
+from retrieval.mmr import maximal_marginal_relevance
 import chromadb
+import asyncio
+import os
 from utils.logger import get_logger
+from utils.registry import registry
 
 logger = get_logger(__name__)
 
+def get_client(persist_directory):
+    """Return the process-wide PersistentClient for a persist directory, opening it on first use."""
+    path = os.path.abspath(persist_directory)
+    return registry.get("chroma_client", path, lambda: chromadb.PersistentClient(path=path), evict=False)
+
 class ChromaVectorStore(BaseVectorStore):
     """Implementation of BaseVectorStore using ChromaDB."""
 
     def __init__(self, collection_name, persist_directory, embedding_model):
         super().__init__(collection_name, persist_directory, embedding_model)
+        self.client = get_client(self.persist_directory)
         self.vectorstore = Chroma(
+            client=self.client,
             collection_name=self.collection_name,
             embedding_function=self.embedding_model,
-            persist_directory=self.persist_directory,
         )
+        self.keyword_index = self.open_keyword_index(self.collection_name)
+        if not self.catalog.has(self.collection_name):
+            self.rebuild_stats()
+        stats = self.collection_stats()
+        if stats and self.keyword_index.document_count() != stats["documents"]:
+            self.rebuild_keyword_index()
         logger.info(f"ChromaDB initialized for collection '{self.collection_name}'.")
 
+    def open_keyword_index(self, collection_name):
+        return open_keyword_index(os.path.join(self.persist_directory, f"{collection_name}_keyword_index.sqlite3"))
+
     def store_documents(self, documents):
-        """Add documents to ChromaDB."""
+        """Upsert documents into ChromaDB under stable IDs, skipping unchanged content."""
+        if not documents:
+            return True
         try:
-            self.vectorstore.add_documents(documents=documents)
-            logger.info(f"Successfully stored {len(documents)} documents in ChromaDB.")
+            unique_docs = {}
+            for doc in documents:
+                doc.metadata["content_hash"] = self.content_hash(doc.page_content)
+                unique_docs[self.document_id(doc)] = doc
+            ids = list(unique_docs.keys())
+
+            existing = self.vectorstore.get(ids=ids, include=["metadatas", "documents"])
+            stored = {
+                doc_id: (metadata or {}, text)
+                for doc_id, metadata, text in zip(existing["ids"], existing["metadatas"], existing["documents"])
+            }
+            changed_ids = [doc_id for doc_id in ids if stored.get(doc_id, ({}, None))[0].get("content_hash") != unique_docs[doc_id].metadata["content_hash"]]
+
+            if changed_ids:
+                self.vectorstore.add_documents(documents=[unique_docs[doc_id] for doc_id in changed_ids], ids=changed_ids)
+                self.keyword_index.add((doc_id, unique_docs[doc_id].page_content, unique_docs[doc_id].metadata) for doc_id in changed_ids)
+
+            sources = list({doc.metadata["source"] for doc in unique_docs.values() if doc.metadata.get("source")})
+            stale_ids, stale = [], []
+            if sources:
+                source_ids = self.vectorstore.get(where={"source": {"$in": sources}}, include=[])["ids"]
+                stale_ids = [doc_id for doc_id in source_ids if doc_id not in unique_docs]
+                if stale_ids:
+                    removed = self.vectorstore.get(ids=stale_ids, include=["metadatas", "documents"])
+                    stale = list(zip(removed["metadatas"], removed["documents"]))
+                    self.vectorstore.delete(ids=stale_ids)
+                    self.keyword_index.remove(stale_ids)
+
+            self.catalog.apply(
+                self.collection_name,
+                added=[(unique_docs[doc_id].metadata, unique_docs[doc_id].page_content) for doc_id in changed_ids],
+                removed=[stored[doc_id] for doc_id in changed_ids if doc_id in stored] + stale
+            )
+
+            if changed_ids or stale_ids:
+                self.bump_generation()
+
+            logger.info(f"Successfully stored {len(documents)} documents in ChromaDB ({len(changed_ids)} embedded, {len(ids) - len(changed_ids)} unchanged, {len(stale_ids)} stale removed).")
+            return True
         except Exception as e:
             logger.error(f"Error loading data into ChromaDB: {e}")
+            return False
+
+    def stored_sources(self, sources):
+        """The subset of source URLs that have at least one chunk in the collection."""
+        sources = list(sources)
+        if not sources:
+            return set()
+        stored = self.vectorstore.get(where={"source": {"$in": sources}}, include=["metadatas"])
+        return {metadata.get("source") for metadata in stored["metadatas"] if metadata}
+
+    def embed_query(self, query_text):
+        """Embed a query through the shared query-embedding cache."""
+        return query_cache.get_or_embed(embedding_model_name(self.embedding_model), query_text, self.embedding_model.embed_query)
+
+    async def aembed_query(self, query_text):
+        """Async embed_query through the shared query-embedding cache."""
+        return await query_cache.aget_or_embed(embedding_model_name(self.embedding_model), query_text, self.embedding_model.aembed_query)
+
+    async def aquery_similar(self, query_text, top_k=5, filter=None):
+        """Async query_similar: awaits the query embedding, then runs the Chroma search in a worker thread."""
+        try:
+            query_embedding = await self.aembed_query(query_text)
+            tuple_output = await asyncio.to_thread(
+                self.vectorstore.similarity_search_by_vector_with_relevance_scores, embedding=query_embedding, k=top_k, filter=filter
+            )
+            return [
+                Document(
+                    id=doc.id,
+                    metadata={**doc.metadata, "score": score},
+                    page_content=doc.page_content
+                )
+                for doc, score in tuple_output
+            ]
+        except Exception as e:
+            logger.error(f"Error querying ChromaDB: {e}")
+            return []
 
     def query_similar(self, query_text, top_k=5, filter=None):
         """Retrieve similar documents from ChromaDB."""
@@ -48,8 +145,9 @@ class ChromaVectorStore(BaseVectorStore):
             # query_embedding = self.embedding_model.embed_query(query_text)
             # results = self.vectorstore.similarity_search_by_vector(query_embedding, k=top_k)
 
-            # Similarity search with score - Convert List[Tuple[Document, float]] to List[Document] with score in metadata
-            tuple_output = self.vectorstore.similarity_search_with_score(query=query_text, k=top_k, filter=filter)
+            # Similarity search with score by a cached query vector - Convert List[Tuple[Document, float]] to List[Document] with score in metadata
+            query_embedding = self.embed_query(query_text)
+            tuple_output = self.vectorstore.similarity_search_by_vector_with_relevance_scores(embedding=query_embedding, k=top_k, filter=filter)
             results = [
                 Document(
                     id=doc.id,
@@ -59,16 +157,156 @@ class ChromaVectorStore(BaseVectorStore):
                 for doc, score in tuple_output
             ]
 
+            logger.info(f"Query embedding cache: {query_cache.stats()}")
             return results
         except Exception as e:
             logger.error(f"Error querying ChromaDB: {e}")
             return []
 
+    def query_diverse(self, query_text, top_k=5, filter=None, fetch_k=Config.MMR_FETCH_K, lambda_mult=Config.MMR_LAMBDA):
+        """Over-fetch candidates with their embeddings and keep a diverse top_k by maximal marginal relevance."""
+        try:
+            query_embedding = self.embed_query(query_text)
+            collection = self.client.get_collection(self.collection_name)
+            query_params = {"where": filter} if filter else {}
+            candidates = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=max(fetch_k, top_k),
+                include=["documents", "metadatas", "distances", "embeddings"],
+                **query_params
+            )
+            selected = maximal_marginal_relevance(query_embedding, candidates["embeddings"][0], top_k, lambda_mult)
+            logger.info(f"MMR kept {len(selected)} of {len(candidates['ids'][0])} candidates.")
+            return [
+                Document(
+                    id=candidates["ids"][0][i],
+                    metadata={**(candidates["metadatas"][0][i] or {}), "score": candidates["distances"][0][i]},
+                    page_content=candidates["documents"][0][i]
+                )
+                for i in selected
+            ]
+        except Exception as e:
+            logger.error(f"Error querying ChromaDB with MMR: {e}")
+            return []
+
+    def diversify(self, query_text, documents, top_k=5, lambda_mult=Config.MMR_LAMBDA):
+        """Re-select a diverse top_k from already retrieved documents by maximal marginal relevance."""
+        if len(documents) <= top_k:
+            return documents
+        try:
+            stored = self.vectorstore.get(ids=[doc.id for doc in documents], include=["embeddings"])
+            embeddings = dict(zip(stored["ids"], stored["embeddings"]))
+            documents = [doc for doc in documents if doc.id in embeddings]
+            selected = maximal_marginal_relevance(self.embed_query(query_text), [embeddings[doc.id] for doc in documents], top_k, lambda_mult)
+            return [documents[i] for i in selected]
+        except Exception as e:
+            logger.error(f"Error diversifying documents: {e}")
+            return documents[:top_k]
+
+    def distance_space(self):
+        """Distance function configured on the collection (Chroma defaults to squared L2)."""
+        collection = self.client.get_collection(self.collection_name)
+        configuration = getattr(collection, "configuration", None) or {}
+        return (collection.metadata or {}).get("hnsw:space") or (configuration.get("hnsw") or {}).get("space") or "l2"
+
+    def score_documents(self, query_text, documents):
+        """Fill in the query distance 'score' for documents that were not retrieved by vector search."""
+        missing = [doc for doc in documents if doc.metadata.get("score") is None]
+        if not missing:
+            return documents
+        try:
+            query_embedding = self.embed_query(query_text)
+            stored = self.vectorstore.get(ids=[doc.id for doc in missing], include=["embeddings"])
+            embeddings = dict(zip(stored["ids"], stored["embeddings"]))
+            space = self.distance_space()
+            for doc in missing:
+                embedding = embeddings.get(doc.id)
+                if embedding is None:
+                    doc.metadata["score"] = float("inf")
+                    continue
+                dot = sum(a * b for a, b in zip(query_embedding, embedding))
+                if space == "cosine":
+                    norms = (sum(a * a for a in query_embedding) * sum(b * b for b in embedding)) ** 0.5
+                    doc.metadata["score"] = 1.0 - dot / norms if norms else 1.0
+                elif space == "ip":
+                    doc.metadata["score"] = 1.0 - dot
+                else:
+                    doc.metadata["score"] = sum((a - b) ** 2 for a, b in zip(query_embedding, embedding))
+        except Exception as e:
+            logger.error(f"Error scoring documents against the query: {e}")
+        return documents
+
+    def rebuild_stats(self, collection_name=None):
+        """Recompute a collection's catalog entry with one paged scan, for collections created before the catalog."""
+        name = collection_name or self.collection_name
+        try:
+            collection = self.client.get_collection(name)
+            pairs = []
+            for offset in range(0, collection.count(), 1000):
+                page = collection.get(include=["metadatas", "documents"], limit=1000, offset=offset)
+                pairs.extend(zip(page["metadatas"], page["documents"]))
+            self.catalog.reset(name)
+            self.catalog.apply(name, added=pairs, ingest=False)
+            logger.info(f"Rebuilt catalog statistics for collection '{name}' ({len(pairs)} documents).")
+        except Exception as e:
+            logger.error(f"Error rebuilding statistics for collection '{name}': {e}")
+        return self.catalog.stats(name)
+
+    def rebuild_keyword_index(self):
+        """Re-index every stored document for keyword search with one paged scan."""
+        try:
+            collection = self.client.get_collection(self.collection_name)
+            self.keyword_index.clear()
+            for offset in range(0, collection.count(), 1000):
+                page = collection.get(include=["metadatas", "documents"], limit=1000, offset=offset)
+                self.keyword_index.add(zip(page["ids"], page["documents"], page["metadatas"]))
+            logger.info(f"Rebuilt keyword index for collection '{self.collection_name}' ({self.keyword_index.document_count()} documents).")
+        except Exception as e:
+            logger.error(f"Error rebuilding keyword index for collection '{self.collection_name}': {e}")
+
+    def _keyword_documents(self, ranked):
+        if not ranked:
+            return []
+        stored = self.vectorstore.get(ids=[doc_id for doc_id, _ in ranked], include=["metadatas", "documents"])
+        by_id = {
+            doc_id: (metadata or {}, content)
+            for doc_id, metadata, content in zip(stored["ids"], stored["metadatas"], stored["documents"])
+        }
+        return [
+            Document(id=doc_id, metadata={**by_id[doc_id][0], "score": score}, page_content=by_id[doc_id][1])
+            for doc_id, score in ranked
+            if doc_id in by_id
+        ]
+
+    def keyword_search(self, text, topics=None, top_k=5, per_source=False, fetch_factor=Config.KEYWORD_FETCH_FACTOR):
+        """Rank documents for a keyword query with BM25 over the inverted index.
+
+        With per_source, chunks are collapsed to their page (metadata source), each
+        page keeping its best-scoring chunk, and top_k counts pages; the top
+        top_k * fetch_factor chunks are ranked first, doubling until top_k pages are found.
+        """
+        try:
+            if not per_source:
+                return self._keyword_documents(self.keyword_index.search(text, topics=topics, top_k=top_k))
+
+            pages, fetched = {}, 0
+            fetch_k = max(1, top_k * fetch_factor)
+            while True:
+                ranked = self.keyword_index.search(text, topics=topics, top_k=fetch_k)
+                for doc in self._keyword_documents(ranked[fetched:]):
+                    pages.setdefault(doc.metadata.get("source", doc.id), doc)
+                fetched = len(ranked)
+                if len(pages) >= top_k or fetched < fetch_k:
+                    return list(pages.values())[:top_k]
+                fetch_k *= 2
+        except Exception as e:
+            logger.error(f"Error running keyword search: {e}")
+            return []
+
     def list_collections(self):
         """List all collections in ChromaDB."""
         try:
-            client = chromadb.PersistentClient(path=self.persist_directory)
-            collection_names = client.list_collections()
+            collection_names = [getattr(collection, "name", collection) for collection in self.client.list_collections()]
 
             if not collection_names:
                 logger.info("No collections found in ChromaDB.")
@@ -76,9 +314,8 @@ class ChromaVectorStore(BaseVectorStore):
 
             logger.info("Collections in ChromaDB:")
             for name in collection_names:
-                collection = client.get_collection(name)
-                total_docs = len(collection.get()["ids"])
-                logger.info(f"- {name} (Documents: {total_docs})")
+                stats = self.collection_stats(name) or self.rebuild_stats(name)
+                logger.info(f"- {name} (Documents: {stats['documents'] if stats else 'unknown'})")
             return collection_names
         except Exception as e:
             logger.error(f"Error listing collections: {e}")
@@ -87,8 +324,7 @@ class ChromaVectorStore(BaseVectorStore):
     def get_collections(self):
         """Get collection in ChromaDB."""
         try:
-            client = chromadb.PersistentClient(path=self.persist_directory)
-            collection_name = client.get_collection(name=self.collection_name)
+            collection_name = self.client.get_collection(name=self.collection_name)
             logger.info(type(collection_name.get(include=["metadatas"])))
             logger.info((collection_name.get(
                 where={"regulation": "transfars"}
@@ -107,8 +343,7 @@ class ChromaVectorStore(BaseVectorStore):
     def get_documents(self, where: dict = None, where_document: str = None, top_k=5):
         """Get collection in ChromaDB."""
         try:
-            client = chromadb.PersistentClient(path=self.persist_directory)
-            collection = client.get_collection(name=self.collection_name)
+            collection = self.client.get_collection(name=self.collection_name)
         
             if not collection:
                 logger.info("Collection not found in ChromaDB.")
@@ -128,8 +363,7 @@ class ChromaVectorStore(BaseVectorStore):
     def iterate_over_collection(self, collection_name):
         """Iterate and display all documents in the specified collection."""
         try:
-            client = chromadb.PersistentClient(path=self.persist_directory)
-            collection = client.get_collection(collection_name)
+            collection = self.client.get_collection(collection_name)
 
             if collection is None:
                 logger.info(f"Collection '{collection_name}' not found.")
@@ -153,6 +387,10 @@ class ChromaVectorStore(BaseVectorStore):
         """Delete the ChromaDB collection."""
         try:
             self.vectorstore.delete()
+            self.catalog.reset(self.collection_name)
+            self.keyword_index.clear()
+            CrawlManifest.remove(self.persist_directory, self.collection_name)
+            self.bump_generation()
             logger.info(f"Collection '{self.collection_name}' deleted successfully.")
         except Exception as e:
             logger.info(f"Error deleting collection '{self.collection_name}': {e}")
@@ -160,8 +398,11 @@ class ChromaVectorStore(BaseVectorStore):
     def delete_specific_collection(self, collection_name):
         """Delete a specific collection by name."""
         try:
-            client = chromadb.PersistentClient(path=self.persist_directory)
-            client.delete_collection(collection_name)
+            self.client.delete_collection(collection_name)
+            self.catalog.reset(collection_name)
+            self.open_keyword_index(collection_name).clear()
+            CrawlManifest.remove(self.persist_directory, collection_name)
+            self.bump_generation(collection_name)
             logger.info(f"Collection '{collection_name}' deleted successfully.")
         except Exception as e:
             logger.info(f"Error deleting collection '{collection_name}': {e}")
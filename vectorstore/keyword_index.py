@@ -0,0 +1,293 @@
+from utils.logger import get_logger
+from utils.registry import registry
+from collections import defaultdict
+from array import array
+import threading
+import heapq
+import sqlite3
+import math
+import os
+import re
+
+logger = get_logger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+PHRASE_BOOST = 0.5
+SQL_BATCH = 500
+
+TOKEN_PATTERN = re.compile(r"\w+")
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _tf_weight(tf, length, average_length):
+    """BM25 term-frequency component; grows with tf and shrinks with document length."""
+    return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+
+def _contains_phrase(term_positions, phrase):
+    """True when the phrase terms occur at consecutive positions."""
+    if any(term not in term_positions for term in phrase):
+        return False
+    following = [set(term_positions[term]) for term in phrase[1:]]
+    return any(
+        all(start + offset + 1 in positions for offset, positions in enumerate(following))
+        for start in term_positions[phrase[0]]
+    )
+
+
+class KeywordIndex:
+    """Persistent inverted index with positional postings, queried with BM25.
+
+    Quoted phrases in a query are required to match exactly; an unquoted
+    multi-word query gets a score boost where its words appear as a phrase.
+
+    Postings carry their term frequency and are read highest tf first, and each
+    term keeps its largest tf and shortest document length, which bound any
+    posting's score. A top_k search stops reading a term's postings once no
+    unseen document can reach the current k-th best score (MaxScore), and decodes
+    positions only for the candidates a phrase check needs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(
+            "CREATE TABLE IF NOT EXISTS documents (doc_id TEXT PRIMARY KEY, topic TEXT, length INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL, "
+            "max_tf INTEGER NOT NULL DEFAULT 0, min_length INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, doc_id TEXT NOT NULL, positions BLOB NOT NULL, "
+            "tf INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (term, doc_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS idx_postings_doc_id ON postings (doc_id);"
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), documents INTEGER NOT NULL, length INTEGER NOT NULL);"
+            "INSERT OR IGNORE INTO totals (id, documents, length) VALUES (0, 0, 0);"
+        )
+        self._migrate()
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_postings_term_tf ON postings (term, tf DESC)")
+        self.connection.commit()
+
+    def _migrate(self):
+        """Add the tf and score-bound columns to an index created before they existed."""
+        if "tf" not in {row[1] for row in self.connection.execute("PRAGMA table_info(postings)")}:
+            self.connection.execute("ALTER TABLE postings ADD COLUMN tf INTEGER NOT NULL DEFAULT 0")
+            self.connection.execute("UPDATE postings SET tf = length(positions) / ?", (array("I").itemsize,))
+        if "max_tf" not in {row[1] for row in self.connection.execute("PRAGMA table_info(terms)")}:
+            self.connection.execute("ALTER TABLE terms ADD COLUMN max_tf INTEGER NOT NULL DEFAULT 0")
+            self.connection.execute("ALTER TABLE terms ADD COLUMN min_length INTEGER NOT NULL DEFAULT 0")
+            self.connection.execute(
+                "UPDATE terms SET max_tf = (SELECT MAX(p.tf) FROM postings p WHERE p.term = terms.term), "
+                "min_length = (SELECT MIN(d.length) FROM postings p JOIN documents d ON d.doc_id = p.doc_id WHERE p.term = terms.term)"
+            )
+            logger.info(f"Added score bounds to keyword index {self.path}.")
+
+    def _remove(self, doc_ids):
+        for doc_id in doc_ids:
+            row = self.connection.execute("SELECT length FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is None:
+                continue
+            terms = [term for (term,) in self.connection.execute("SELECT term FROM postings WHERE doc_id = ?", (doc_id,))]
+            self.connection.executemany("UPDATE terms SET df = df - 1 WHERE term = ?", [(term,) for term in terms])
+            self.connection.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            self.connection.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            self.connection.execute("UPDATE totals SET documents = documents - 1, length = length - ? WHERE id = 0", (row[0],))
+        self.connection.execute("DELETE FROM terms WHERE df <= 0")
+
+    def add(self, entries):
+        """Index (doc_id, text, metadata) entries, replacing any previous version of each document."""
+        entries = list(entries)
+        with self._lock:
+            self._remove([doc_id for doc_id, _, _ in entries])
+            for doc_id, text, metadata in entries:
+                tokens = tokenize(text or "")
+                positions = defaultdict(list)
+                for position, token in enumerate(tokens):
+                    positions[token].append(position)
+
+                self.connection.execute(
+                    "INSERT INTO documents (doc_id, topic, length) VALUES (?, ?, ?)",
+                    (doc_id, (metadata or {}).get("topic"), len(tokens))
+                )
+                self.connection.executemany(
+                    "INSERT INTO postings (term, doc_id, positions, tf) VALUES (?, ?, ?, ?)",
+                    [(term, doc_id, array("I", term_positions).tobytes(), len(term_positions)) for term, term_positions in positions.items()]
+                )
+                # Bounds only ever loosen on removal, so they stay valid without being recomputed.
+                self.connection.executemany(
+                    "INSERT INTO terms (term, df, max_tf, min_length) VALUES (?, 1, ?, ?) ON CONFLICT (term) DO UPDATE SET "
+                    "df = df + 1, max_tf = MAX(max_tf, excluded.max_tf), min_length = MIN(min_length, excluded.min_length)",
+                    [(term, len(term_positions), len(tokens)) for term, term_positions in positions.items()]
+                )
+                self.connection.execute("UPDATE totals SET documents = documents + 1, length = length + ? WHERE id = 0", (len(tokens),))
+            self.connection.commit()
+
+    def remove(self, doc_ids):
+        with self._lock:
+            self._remove(list(doc_ids))
+            self.connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self.connection.executescript(
+                "DELETE FROM postings; DELETE FROM terms; DELETE FROM documents; "
+                "UPDATE totals SET documents = 0, length = 0 WHERE id = 0;"
+            )
+            self.connection.commit()
+
+    def document_count(self):
+        with self._lock:
+            return self.connection.execute("SELECT documents FROM totals WHERE id = 0").fetchone()[0]
+
+    def _positions(self, doc_id, terms):
+        rows = self.connection.execute(
+            f"SELECT term, positions FROM postings WHERE doc_id = ? AND term IN ({','.join('?' * len(terms))})",
+            [doc_id, *terms]
+        )
+        return {term: array("I", blob) for term, blob in rows}
+
+    def search(self, query, topics=None, top_k=5):
+        """Return [(doc_id, score)] ranked by BM25, optionally restricted to the given topics; top_k=None returns every match."""
+        phrases = [tokenize(phrase) for phrase in PHRASE_PATTERN.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        query_phrase = tokenize(PHRASE_PATTERN.sub(" ", query))
+        boost = 1 + PHRASE_BOOST if len(query_phrase) > 1 else 1.0
+        required_terms = {term for phrase in phrases for term in phrase}
+        # Pruning needs every candidate's final score to be at least its BM25 score, which quoted phrase filters break.
+        prune = top_k is not None and not phrases
+
+        with self._lock:
+            total_docs, total_length = self.connection.execute("SELECT documents, length FROM totals WHERE id = 0").fetchone()
+            if not total_docs:
+                return []
+            average_length = total_length / total_docs
+
+            topic_clause, topic_params = "", []
+            if topics:
+                topic_clause = f" AND d.topic IN ({','.join('?' * len(topics))})"
+                topic_params = list(topics)
+
+            term_stats = []
+            for term in terms:
+                row = self.connection.execute("SELECT df, max_tf, min_length FROM terms WHERE term = ?", (term,)).fetchone()
+                if row is None:
+                    continue
+                df, max_tf, min_length = row
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                term_stats.append((idf * _tf_weight(max_tf, min_length, average_length), term, idf, min_length))
+            term_stats.sort(reverse=True)
+
+            scores, matched = {}, defaultdict(set)
+            fully_read = set()
+            rest = sum(bound for bound, _, _, _ in term_stats)
+            for bound, term, idf, min_length in term_stats:
+                rest -= bound
+                top = heapq.nlargest(top_k, scores.values()) if prune else []
+                heapq.heapify(top)
+                threshold = top[0] if prune and len(top) >= top_k else 0.0
+                # A document first seen now lacks every fully read term, so it cannot get the phrase boost if one is in the phrase.
+                new_boost = 1.0 if fully_read & set(query_phrase) else boost
+
+                seen = set()
+                for doc_id, tf, length in self.connection.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN documents d ON d.doc_id = p.doc_id "
+                    f"WHERE p.term = ?{topic_clause} ORDER BY p.tf DESC",
+                    [term, *topic_params]
+                ):
+                    if threshold and new_boost * (idf * _tf_weight(tf, min_length, average_length) + rest) <= threshold:
+                        break
+                    weight = idf * _tf_weight(tf, length, average_length)
+                    seen.add(doc_id)
+                    matched[doc_id].add(term)
+                    if doc_id in scores:
+                        scores[doc_id] += weight
+                        continue
+                    scores[doc_id] = weight
+                    if prune:
+                        heapq.heappush(top, weight)
+                        if len(top) > top_k:
+                            heapq.heappop(top)
+                        if len(top) >= top_k:
+                            threshold = top[0]
+                else:
+                    fully_read.add(term)
+                    continue
+
+                # Stopped early: drop candidates that can no longer reach the top k, and add this term for the rest.
+                for doc_id in [doc_id for doc_id in scores if doc_id not in seen]:
+                    if boost * (scores[doc_id] + bound + rest) <= threshold:
+                        del scores[doc_id]
+                pending = [doc_id for doc_id in scores if doc_id not in seen]
+                for start in range(0, len(pending), SQL_BATCH):
+                    batch = pending[start:start + SQL_BATCH]
+                    for doc_id, tf, length in self.connection.execute(
+                        "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN documents d ON d.doc_id = p.doc_id "
+                        f"WHERE p.term = ? AND p.doc_id IN ({','.join('?' * len(batch))})",
+                        [term, *batch]
+                    ):
+                        scores[doc_id] += idf * _tf_weight(tf, length, average_length)
+                        matched[doc_id].add(term)
+
+            ranked, top = [], []
+            for doc_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+                if top_k is not None and len(top) >= top_k and score * boost < top[0]:
+                    break
+                if not required_terms <= matched[doc_id]:
+                    continue
+                # Positions are decoded only when every term of a phrase check is present.
+                boostable = boost > 1 and set(query_phrase) <= matched[doc_id]
+                if phrases or boostable:
+                    term_positions = self._positions(doc_id, terms)
+                    if not all(_contains_phrase(term_positions, phrase) for phrase in phrases):
+                        continue
+                    if boostable and _contains_phrase(term_positions, query_phrase):
+                        score *= boost
+                ranked.append((doc_id, score))
+                if top_k is not None:
+                    heapq.heappush(top, score)
+                    if len(top) > top_k:
+                        heapq.heappop(top)
+
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+
+def open_keyword_index(path):
+    """Return the process-wide KeywordIndex for a path, creating it on first use."""
+    return registry.get("keyword_index", path, lambda: KeywordIndex(path), evict=False)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import random
+    import time
+
+    random.seed(0)
+    vocabulary = [f"word{i}" for i in range(20000)]
+    # Uniform text gives every posting tf=1 and leaves nothing to prune; the
+    # Zipfian corpus is closer to real prose, where common terms dominate.
+    distributions = {"uniform": None, "zipf": [1 / (rank + 1) for rank in range(len(vocabulary))]}
+
+    for distribution, weights in distributions.items():
+        with tempfile.TemporaryDirectory() as directory:
+            index = KeywordIndex(os.path.join(directory, "keyword_index.sqlite3"))
+            indexed = 0
+            for corpus_size in [1000, 10000, 50000]:
+                index.add(
+                    (f"doc-{i}", " ".join(random.choices(vocabulary, weights, k=200)), {"topic": "content"})
+                    for i in range(indexed, corpus_size)
+                )
+                indexed = corpus_size
+
+                queries = [" ".join(random.choices(vocabulary, weights, k=2)) for _ in range(200)]
+                start = time.perf_counter()
+                for query in queries:
+                    index.search(query, top_k=10)
+                elapsed = (time.perf_counter() - start) / len(queries)
+                print(f"{distribution:<8} documents={corpus_size:>6}  {elapsed * 1000:6.2f} ms/query")